@@ -1,6 +1,7 @@
 # Query processing Lambda function
 
 from .rag_chain import ArchonRAGChain, RAGChainError, Document
+from .query_cache import QueryCache
 from .query_handler import (
     QueryHandler,
     QueryValidationError,
@@ -14,6 +15,7 @@ __all__ = [
     'ArchonRAGChain',
     'RAGChainError',
     'Document',
+    'QueryCache',
     'QueryHandler',
     'QueryValidationError',
     'QueryResponse',
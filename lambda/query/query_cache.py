@@ -0,0 +1,242 @@
+"""In-process semantic cache for RAG query results."""
+
+import hashlib
+from collections import OrderedDict
+from typing import Any, List, Optional
+
+import numpy as np
+
+# Try to import hnswlib, but make it optional
+try:
+    import hnswlib
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    HNSWLIB_AVAILABLE = False
+    hnswlib = None
+
+
+class QueryCache:
+    """
+    Two-tier cache for RAG chain results.
+
+    The exact tier maps a SHA-256 hash of the normalized query text to its
+    result, so verbatim repeats are answered without computing an embedding.
+
+    The semantic tier stores query embeddings as L2-normalized FP32 rows in
+    a preallocated matrix, so a lookup is a single BLAS matrix-vector product
+    producing the cosine similarity against every cached query. A lookup
+    hits when the best score reaches the similarity threshold. Rows stay in
+    FP32 because NumPy has no BLAS kernel for FP16, which scores an order of
+    magnitude slower than it saves in memory.
+
+    When hnswlib is installed and the cache holds more than ANN_MIN_ENTRIES
+    entries, lookups switch to an in-memory HNSW index over the same rows,
+    replacing the linear scan with an approximate nearest neighbor search.
+
+    Both tiers hold at most max_entries results and evict the least
+    recently used entry when full.
+    """
+
+    DEFAULT_SIMILARITY_THRESHOLD = 0.95
+    DEFAULT_MAX_ENTRIES = 2048
+    
+    # Below this size the linear scan is faster than an HNSW search
+    ANN_MIN_ENTRIES = 256
+    ANN_EF_CONSTRUCTION = 100
+    ANN_M = 16
+    ANN_EF = 32
+
+    def __init__(
+        self,
+        similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        """
+        Initialize the query cache.
+
+        Args:
+            similarity_threshold: Minimum cosine similarity for a cache hit
+            max_entries: Maximum number of cached results (0 disables caching)
+        """
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max(0, max_entries)
+
+        # Embedding matrix is allocated on first insert, once the dimension is known
+        self._cache_embeddings: Optional[np.ndarray] = None
+        self._cache_entries: List[Any] = [None] * self.max_entries
+        self._last_used = np.zeros(self.max_entries, dtype=np.int64)
+        self._scores = np.empty(self.max_entries, dtype=np.float32)
+        self._clock = 0
+        self._size = 0
+
+        # HNSW index over the embedding rows, built once the cache is large enough
+        self._ann = None
+        
+        # Exact-match tier, kept in LRU order
+        self._exact_cache: "OrderedDict[bytes, Any]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache can hold any entries."""
+        return self.max_entries > 0
+
+    def _normalize(self, embedding: List[float]) -> Optional[np.ndarray]:
+        """
+        Convert an embedding to a unit-length FP32 vector.
+
+        Returns:
+            Normalized vector, or None if it cannot be compared against the cache
+        """
+        vector = np.asarray(embedding, dtype=np.float32)
+        if vector.ndim != 1:
+            return None
+
+        if self._cache_embeddings is not None and vector.shape[0] != self._cache_embeddings.shape[1]:
+            return None
+
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            return None
+
+        return vector / norm
+
+    @staticmethod
+    def _exact_key(query: str) -> bytes:
+        """Hash the normalized query text."""
+        return hashlib.sha256(query.strip().lower().encode()).digest()
+
+    def lookup_exact(self, query: str) -> Optional[Any]:
+        """
+        Find a cached result for the same query text.
+
+        Matching ignores surrounding whitespace and case.
+
+        Args:
+            query: Query string
+
+        Returns:
+            Cached result, or None on a miss
+        """
+        if not self._exact_cache:
+            return None
+
+        key = self._exact_key(query)
+        result = self._exact_cache.get(key)
+        if result is not None:
+            self._exact_cache.move_to_end(key)
+        return result
+
+    def insert_exact(self, query: str, result: Any) -> None:
+        """
+        Store a result for the query text.
+
+        Args:
+            query: Query string
+            result: RAG chain result to cache; stored and returned as is
+        """
+        if not self.enabled:
+            return
+
+        key = self._exact_key(query)
+        self._exact_cache[key] = result
+        self._exact_cache.move_to_end(key)
+        if len(self._exact_cache) > self.max_entries:
+            self._exact_cache.popitem(last=False)
+
+    def lookup(self, embedding: List[float]) -> Optional[Any]:
+        """
+        Find a cached result for a semantically similar query.
+
+        Args:
+            embedding: Query embedding vector
+
+        Returns:
+            Cached result, or None on a miss
+        """
+        if self._size == 0:
+            return None
+
+        vector = self._normalize(embedding)
+        if vector is None:
+            return None
+
+        if self._ann is not None:
+            labels, distances = self._ann.knn_query(vector, k=1)
+            best = int(labels[0][0])
+            # Inner product distance is 1 - cosine similarity for unit vectors
+            score = 1.0 - float(distances[0][0])
+        else:
+            # Score into a preallocated buffer to avoid a per-lookup allocation
+            scores = self._scores[:self._size]
+            np.dot(self._cache_embeddings[:self._size], vector, out=scores)
+            best = int(np.argmax(scores))
+            score = scores[best]
+        
+        if score < self.similarity_threshold:
+            return None
+
+        self._clock += 1
+        self._last_used[best] = self._clock
+        return self._cache_entries[best]
+
+    def insert(self, embedding: List[float], result: Any) -> None:
+        """
+        Store a result for a query embedding.
+
+        Args:
+            embedding: Query embedding vector
+            result: RAG chain result to cache; stored and returned as is
+        """
+        if not self.enabled:
+            return
+
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+
+        if self._cache_embeddings is None:
+            self._cache_embeddings = np.empty(
+                (self.max_entries, vector.shape[0]),
+                dtype=np.float32
+            )
+
+        if self._size < self.max_entries:
+            slot = self._size
+            self._size += 1
+        else:
+            slot = int(np.argmin(self._last_used))
+
+        self._clock += 1
+        self._cache_embeddings[slot] = vector
+        self._cache_entries[slot] = result
+        self._last_used[slot] = self._clock
+        
+        if self._ann is not None:
+            # Re-adding an existing label replaces its vector
+            self._ann.add_items(vector[np.newaxis, :], [slot])
+        elif HNSWLIB_AVAILABLE and self._size > self.ANN_MIN_ENTRIES:
+            self._build_ann()
+    
+    def _build_ann(self) -> None:
+        """Build the HNSW index from the cached embedding rows."""
+        dimension = self._cache_embeddings.shape[1]
+        index = hnswlib.Index(space='ip', dim=dimension)
+        index.init_index(
+            max_elements=self.max_entries,
+            ef_construction=self.ANN_EF_CONSTRUCTION,
+            M=self.ANN_M
+        )
+        index.add_items(self._cache_embeddings[:self._size], np.arange(self._size))
+        index.set_ef(self.ANN_EF)
+        self._ann = index
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        self._cache_entries = [None] * self.max_entries
+        self._last_used[:] = 0
+        self._size = 0
+        self._ann = None
+        self._exact_cache.clear()
@@ -1,15 +1,19 @@
 """Query handler Lambda function for Archon RAG system."""
 
-import json
 import os
-from datetime import datetime
+import threading
 from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 
+import boto3
+import orjson
+from botocore.config import Config
+
+from shared.logging_utils import utc_timestamp
 from .rag_chain import ArchonRAGChain, RAGChainError
 
 
-@dataclass
+@dataclass(slots=True)
 class SourceReference:
     """Reference to a source document."""
     repo: str
@@ -18,7 +22,7 @@ class SourceReference:
     chunk_text: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class QueryResponse:
     """Response to a query request."""
     answer: str
@@ -47,16 +51,26 @@ class QueryHandler:
     MIN_QUERY_LENGTH = 1
     MAX_QUERY_LENGTH = 1000
     
-    def __init__(self, rag_chain: ArchonRAGChain, max_results: int = 5):
+    def __init__(
+        self,
+        rag_chain: ArchonRAGChain,
+        max_results: int = 5,
+        max_chunk_chars: Optional[int] = None,
+        include_chunk_text: bool = True
+    ):
         """
         Initialize the query handler.
         
         Args:
             rag_chain: Configured ArchonRAGChain instance
             max_results: Maximum number of source documents to return
+            max_chunk_chars: Maximum characters of chunk text per source (None for no limit)
+            include_chunk_text: Whether sources include chunk text by default
         """
         self.rag_chain = rag_chain
         self.max_results = max_results
+        self.max_chunk_chars = max_chunk_chars
+        self.include_chunk_text = include_chunk_text
     
     def validate_query(self, query: str) -> bool:
         """
@@ -75,12 +89,14 @@ class QueryHandler:
         if not isinstance(query, str):
             raise QueryValidationError("Query must be a string")
         
+        # Strip once and validate the remaining length
+        query_length = len(query.strip())
+        
         # Check if query is empty or only whitespace
-        if not query or not query.strip():
+        if query_length == 0:
             raise QueryValidationError("Query cannot be empty")
         
         # Check query length
-        query_length = len(query.strip())
         if query_length < self.MIN_QUERY_LENGTH:
             raise QueryValidationError(
                 f"Query is too short (minimum {self.MIN_QUERY_LENGTH} characters)"
@@ -93,13 +109,20 @@ class QueryHandler:
         
         return True
     
-    def handle_query(self, query: str, max_results: Optional[int] = None) -> QueryResponse:
+    def handle_query(
+        self,
+        query: str,
+        max_results: Optional[int] = None,
+        include_chunks: Optional[bool] = None
+    ) -> QueryResponse:
         """
         Process a user query through the RAG pipeline.
         
         Args:
             query: User query string
             max_results: Optional override for maximum results
+            include_chunks: Optional override to return full chunk text (True)
+                or none (False)
             
         Returns:
             QueryResponse with answer and sources
@@ -111,9 +134,6 @@ class QueryHandler:
         # Validate query
         self.validate_query(query)
         
-        # Use provided max_results or default
-        k = max_results if max_results is not None else self.max_results
-        
         # Invoke RAG chain
         try:
             result = self.rag_chain.invoke(query)
@@ -122,61 +142,118 @@ class QueryHandler:
         except Exception as e:
             raise RAGChainError(f"Failed to process query: {str(e)}") from e
         
+        return self._to_response(result, query, max_results, include_chunks)
+    
+    async def ahandle_query(
+        self,
+        query: str,
+        max_results: Optional[int] = None,
+        include_chunks: Optional[bool] = None
+    ) -> QueryResponse:
+        """
+        Asynchronously process a user query through the RAG pipeline.
+        
+        Args:
+            query: User query string
+            max_results: Optional override for maximum results
+            include_chunks: Optional override to return full chunk text (True)
+                or none (False)
+            
+        Returns:
+            QueryResponse with answer and sources
+            
+        Raises:
+            QueryValidationError: If query is invalid
+            RAGChainError: If RAG processing fails
+        """
+        self.validate_query(query)
+        
+        try:
+            result = await self.rag_chain.ainvoke(query)
+        except RAGChainError:
+            raise
+        except Exception as e:
+            raise RAGChainError(f"Failed to process query: {str(e)}") from e
+        
+        return self._to_response(result, query, max_results, include_chunks)
+    
+    def _to_response(
+        self,
+        result: Dict[str, Any],
+        query: str,
+        max_results: Optional[int],
+        include_chunks: Optional[bool] = None
+    ) -> QueryResponse:
+        """Format a RAG chain result, keeping at most max_results sources."""
+        # Use provided max_results or default
+        k = max_results if max_results is not None else self.max_results
+        
         # Extract answer and sources
         answer = result.get("result", "")
         source_documents = result.get("source_documents", [])
         
         # Format response
-        response = self.format_response(
+        return self.format_response(
             llm_response=answer,
             sources=source_documents[:k],
-            query=query
+            query=query,
+            include_chunks=include_chunks
         )
-        
-        return response
+    
+    @staticmethod
+    def _truncate(text: Optional[str], limit: Optional[int]) -> Optional[str]:
+        """Truncate text to at most limit characters."""
+        if text is None or limit is None:
+            return text
+        return text[:limit]
     
     def format_response(
         self,
         llm_response: str,
         sources: List[Dict[str, Any]],
-        query: str
+        query: str,
+        include_chunks: Optional[bool] = None
     ) -> QueryResponse:
         """
         Format the response with source references.
         
+        Chunk text is truncated to max_chunk_chars unless include_chunks is
+        True, and omitted when include_chunks is False or, by default, when
+        include_chunk_text is disabled.
+        
         Args:
             llm_response: Generated answer from LLM
             sources: List of source documents with metadata
             query: Original query string
+            include_chunks: Optional override to return full chunk text (True)
+                or none (False)
             
         Returns:
             Formatted QueryResponse object
         """
+        if include_chunks is None:
+            include_text = self.include_chunk_text
+            limit = self.max_chunk_chars
+        else:
+            include_text = include_chunks
+            limit = None
+        
         # Convert source documents to SourceReference objects
-        source_refs = []
-        for source in sources:
-            metadata = source.get("metadata", {})
-            
-            # Extract required fields
-            repo = metadata.get("repo_url", "")
-            file_path = metadata.get("file_path", "")
-            score = source.get("score", 0.0)
-            chunk_text = source.get("text", None)
-            
-            source_refs.append(SourceReference(
-                repo=repo,
-                file_path=file_path,
-                relevance_score=score,
-                chunk_text=chunk_text
-            ))
+        source_refs = [
+            SourceReference(
+                repo=(metadata := source.get("metadata") or {}).get("repo_url", ""),
+                file_path=metadata.get("file_path", ""),
+                relevance_score=source.get("score", 0.0),
+                chunk_text=self._truncate(source.get("text"), limit) if include_text else None
+            )
+            for source in sources
+        ]
         
         # Create response with timestamp
-        timestamp = datetime.utcnow().isoformat() + "Z"
-        
         return QueryResponse(
             answer=llm_response,
             sources=source_refs,
-            timestamp=timestamp,
+            timestamp=utc_timestamp(),
             query=query
         )
 
@@ -193,14 +270,12 @@ def create_error_response(error_code: str, message: str, details: str = "") -> D
     Returns:
         Error response dictionary
     """
-    timestamp = datetime.utcnow().isoformat() + "Z"
-    
     response = {
         "error": {
             "code": error_code,
             "message": message
         },
-        "timestamp": timestamp
+        "timestamp": utc_timestamp()
     }
     
     if details:
@@ -209,6 +284,100 @@ def create_error_response(error_code: str, message: str, details: str = "") -> D
     return response
 
 
+def _to_json(obj: Any) -> str:
+    """
+    Serialize a response body to a JSON string.
+    
+    orjson encodes dataclasses such as QueryResponse directly, without the
+    deep copy made by dataclasses.asdict.
+    
+    Args:
+        obj: Response dataclass or dictionary
+        
+    Returns:
+        JSON string
+    """
+    return orjson.dumps(obj).decode()
+
+
+# Configuration is read once per container
+OPENSEARCH_ENDPOINT = os.environ.get("OPENSEARCH_ENDPOINT")
+INDEX_NAME = os.environ.get("INDEX_NAME", "archon-docs")
+EMBEDDING_MODEL = os.environ.get("EMBEDDING_MODEL", "amazon.titan-embed-text-v1")
+LLM_MODEL = os.environ.get("LLM_MODEL", "anthropic.claude-3-haiku-20240307")
+RETRIEVAL_K = int(os.environ.get("RETRIEVAL_K", "5"))
+CACHE_SIMILARITY_THRESHOLD = float(os.environ.get("CACHE_SIMILARITY_THRESHOLD", "0.95"))
+CACHE_MAX = int(os.environ.get("CACHE_MAX", "2048"))
+OS_POOL_MAXSIZE = int(os.environ.get("OS_POOL_MAXSIZE", "20"))
+MAX_CHUNK_CHARS = int(os.environ.get("MAX_CHUNK_CHARS", "500"))
+INCLUDE_CHUNK_TEXT = os.environ.get("INCLUDE_CHUNK_TEXT", "true").lower() == "true"
+
+# Bedrock client settings: keep-alive connections reused across invocations
+BEDROCK_CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    connect_timeout=1,
+    read_timeout=30,
+    retries={"max_attempts": 2, "mode": "adaptive"}
+)
+
+# Largest request body parsed; queries are capped well below this
+MAX_BODY_BYTES = 8192
+
+# Query handler shared by all invocations in this container
+_handler: Optional[QueryHandler] = None
+_handler_lock = threading.Lock()
+
+
+def _get_handler() -> QueryHandler:
+    """
+    Get or create the query handler for this container.
+    
+    The vector store, RAG chain, and Bedrock clients are built on first use
+    and reused by later warm invocations, so their connections and the
+    query cache persist across requests.
+    
+    Returns:
+        Shared QueryHandler instance
+    """
+    global _handler
+    
+    if _handler is None:
+        with _handler_lock:
+            if _handler is None:
+                # Import here to avoid circular dependencies
+                from storage.vector_store_manager import VectorStoreManager
+                
+                vector_store = VectorStoreManager(
+                    opensearch_endpoint=OPENSEARCH_ENDPOINT,
+                    index_name=INDEX_NAME,
+                    embedding_model=EMBEDDING_MODEL,
+                    client_kwargs={"pool_maxsize": OS_POOL_MAXSIZE}
+                )
+                
+                # One bedrock-runtime client is shared by the LLM and embeddings
+                bedrock_client = boto3.client("bedrock-runtime", config=BEDROCK_CLIENT_CONFIG)
+                
+                rag_chain = ArchonRAGChain(
+                    vector_store_manager=vector_store,
+                    llm_model=LLM_MODEL,
+                    embedding_model=EMBEDDING_MODEL,
+                    retrieval_k=RETRIEVAL_K,
+                    bedrock_client=bedrock_client,
+                    cache_similarity_threshold=CACHE_SIMILARITY_THRESHOLD,
+                    cache_max_entries=CACHE_MAX
+                )
+                
+                _handler = QueryHandler(
+                    rag_chain=rag_chain,
+                    max_results=RETRIEVAL_K,
+                    max_chunk_chars=MAX_CHUNK_CHARS,
+                    include_chunk_text=INCLUDE_CHUNK_TEXT
+                )
+    
+    return _handler
+
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda handler for query processing.
@@ -222,59 +391,55 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     try:
         # Parse request body
-        if isinstance(event.get("body"), str):
-            body = json.loads(event["body"])
+        raw_body = event.get("body")
+        if isinstance(raw_body, (str, bytes)):
+            # Reject oversized bodies before parsing them; str bodies are measured in UTF-8 bytes
+            body_bytes = raw_body.encode() if isinstance(raw_body, str) else raw_body
+            if len(body_bytes) > MAX_BODY_BYTES:
+                return {
+                    "statusCode": 413,
+                    "headers": {"Content-Type": "application/json"},
+                    "body": _to_json(create_error_response(
+                        "PAYLOAD_TOO_LARGE",
+                        "Request body is too large",
+                        f"Maximum request body size is {MAX_BODY_BYTES} bytes"
+                    ))
+                }
+            body = orjson.loads(body_bytes)
         else:
             body = event.get("body", {})
         
         query = body.get("query", "")
         max_results = body.get("max_results", None)
+        include_chunks = body.get("include_chunks", None)
         
-        # Initialize components (in production, these would be initialized once)
-        # For now, we'll need environment variables for configuration
-        opensearch_endpoint = os.environ.get("OPENSEARCH_ENDPOINT")
-        index_name = os.environ.get("INDEX_NAME", "archon-docs")
-        embedding_model = os.environ.get("EMBEDDING_MODEL", "amazon.titan-embed-text-v1")
-        llm_model = os.environ.get("LLM_MODEL", "anthropic.claude-3-haiku-20240307")
-        retrieval_k = int(os.environ.get("RETRIEVAL_K", "5"))
+        # A string such as "false" is truthy, so only JSON booleans are accepted
+        if include_chunks is not None and not isinstance(include_chunks, bool):
+            return {
+                "statusCode": 400,
+                "headers": {"Content-Type": "application/json"},
+                "body": _to_json(create_error_response(
+                    "INVALID_REQUEST",
+                    "include_chunks must be a boolean",
+                    f"Got {type(include_chunks).__name__}"
+                ))
+            }
         
-        if not opensearch_endpoint:
+        if not OPENSEARCH_ENDPOINT:
             return {
                 "statusCode": 500,
                 "headers": {"Content-Type": "application/json"},
-                "body": json.dumps(create_error_response(
+                "body": _to_json(create_error_response(
                     "CONFIGURATION_ERROR",
                     "OpenSearch endpoint not configured",
                     "OPENSEARCH_ENDPOINT environment variable is required"
                 ))
             }
         
-        # Import here to avoid circular dependencies
-        from storage.vector_store_manager import VectorStoreManager
-        
-        # Initialize vector store manager
-        vector_store = VectorStoreManager(
-            opensearch_endpoint=opensearch_endpoint,
-            index_name=index_name,
-            embedding_model=embedding_model
-        )
-        
-        # Initialize RAG chain
-        rag_chain = ArchonRAGChain(
-            vector_store_manager=vector_store,
-            llm_model=llm_model,
-            embedding_model=embedding_model,
-            retrieval_k=retrieval_k
-        )
-        
-        # Initialize query handler
-        handler = QueryHandler(rag_chain=rag_chain, max_results=retrieval_k)
+        handler = _get_handler()
         
         # Process query
-        response = handler.handle_query(query, max_results)
-        
-        # Convert response to dictionary
-        response_dict = asdict(response)
+        response = handler.handle_query(query, max_results, include_chunks)
         
         # Return success response
         return {
@@ -283,7 +448,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 "Content-Type": "application/json",
                 "Access-Control-Allow-Origin": "*"
             },
-            "body": json.dumps(response_dict)
+            "body": _to_json(response)
         }
         
     except QueryValidationError as e:
@@ -296,7 +461,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         return {
             "statusCode": 400,
             "headers": {"Content-Type": "application/json"},
-            "body": json.dumps(error_response)
+            "body": _to_json(error_response)
         }
         
     except RAGChainError as e:
@@ -309,10 +474,10 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         return {
             "statusCode": 500,
             "headers": {"Content-Type": "application/json"},
-            "body": json.dumps(error_response)
+            "body": _to_json(error_response)
         }
         
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         # Invalid JSON in request
         error_response = create_error_response(
             "INVALID_REQUEST",
@@ -322,7 +487,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         return {
             "statusCode": 400,
             "headers": {"Content-Type": "application/json"},
-            "body": json.dumps(error_response)
+            "body": _to_json(error_response)
         }
         
     except Exception as e:
@@ -335,5 +500,5 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         return {
             "statusCode": 500,
             "headers": {"Content-Type": "application/json"},
-            "body": json.dumps(error_response)
+            "body": _to_json(error_response)
         }
@@ -1,15 +1,16 @@
 """RAG chain implementation using LangChain for Archon system."""
 
-from typing import Dict, Any, List, Optional
+import io
+from types import MappingProxyType
+from typing import Dict, Any, Iterator, List, Mapping, NamedTuple, Optional, Tuple
 from dataclasses import dataclass
 
 from langchain_aws import ChatBedrock, BedrockEmbeddings
-from langchain_classic.chains import RetrievalQA
-from langchain_classic.prompts import PromptTemplate
-from langchain_core.documents import Document as LangChainDocument
 
+from .query_cache import QueryCache
 
-@dataclass
+
+@dataclass(slots=True)
 class Document:
     """Represents a retrieved document with metadata."""
     text: str
@@ -17,11 +18,48 @@ class Document:
     score: float
 
 
+class _CachedResult(NamedTuple):
+    """
+    Immutable cache entry for an invoke result.
+    
+    Cached results are shared by every later hit, so they are stored as
+    tuples and read-only mappings and expanded into a fresh result dict
+    for each caller.
+    """
+    answer: str
+    sources: Tuple[Tuple[str, Mapping[str, Any], float], ...]
+    
+    def to_result(self) -> Dict[str, Any]:
+        """Build a new invoke result dictionary from the cached entry."""
+        return {
+            "result": self.answer,
+            "source_documents": [
+                {"text": text, "metadata": dict(metadata), "score": score}
+                for text, metadata, score in self.sources
+            ]
+        }
+
+
 class RAGChainError(Exception):
     """Base exception for RAG chain errors."""
     pass
 
 
+def _split_prompt_template(template: str) -> Tuple[str, str, str]:
+    """
+    Split a prompt template around its {context} and {question} placeholders.
+    
+    Args:
+        template: Template containing {context} followed by {question}
+        
+    Returns:
+        Tuple of (prefix, middle, suffix) literal text
+    """
+    prefix, _, rest = template.partition("{context}")
+    middle, _, suffix = rest.partition("{question}")
+    return prefix, middle, suffix
+
+
 class ArchonRAGChain:
     """
     RAG chain for Archon system using LangChain.
@@ -31,6 +69,7 @@ class ArchonRAGChain:
     - Context preparation for LLM
     - Response generation using AWS Bedrock
     - Source document tracking
+    - Semantic caching of results for similar queries
     """
     
     # Default prompt template for Archon
@@ -49,6 +88,9 @@ the specific documents you reference.
 
 Answer:"""
     
+    # Literal text around the default template's placeholders, split once
+    _DEFAULT_PROMPT_PARTS = _split_prompt_template(DEFAULT_PROMPT_TEMPLATE)
+    
     def __init__(
         self,
         vector_store_manager,
@@ -59,7 +101,10 @@ Answer:"""
         retrieval_k: int = 5,
         prompt_template: Optional[str] = None,
         llm: Optional[ChatBedrock] = None,
-        embeddings: Optional[BedrockEmbeddings] = None
+        embeddings: Optional[BedrockEmbeddings] = None,
+        bedrock_client: Optional[Any] = None,
+        cache_similarity_threshold: float = QueryCache.DEFAULT_SIMILARITY_THRESHOLD,
+        cache_max_entries: int = QueryCache.DEFAULT_MAX_ENTRIES
     ):
         """
         Initialize the RAG chain.
@@ -74,6 +119,10 @@ Answer:"""
             prompt_template: Optional custom prompt template
             llm: Optional pre-configured LLM (for testing)
             embeddings: Optional pre-configured embeddings (for testing)
+            bedrock_client: Optional bedrock-runtime client shared by the default
+                LLM and embeddings
+            cache_similarity_threshold: Minimum cosine similarity for a cache hit
+            cache_max_entries: Maximum number of cached results (0 disables caching)
         """
         self.vector_store_manager = vector_store_manager
         self.llm_model = llm_model
@@ -86,7 +135,7 @@ Answer:"""
         if embeddings is not None:
             self.embeddings = embeddings
         else:
-            self.embeddings = BedrockEmbeddings(model_id=embedding_model)
+            self.embeddings = BedrockEmbeddings(model_id=embedding_model, client=bedrock_client)
         
         # Initialize LLM
         if llm is not None:
@@ -94,61 +143,71 @@ Answer:"""
         else:
             self.llm = ChatBedrock(
                 model_id=llm_model,
+                client=bedrock_client,
                 model_kwargs={
                     "temperature": temperature,
                     "max_tokens": max_tokens
                 }
             )
         
-        # Set up prompt template
-        template_text = prompt_template if prompt_template else self.DEFAULT_PROMPT_TEMPLATE
-        self.prompt = PromptTemplate(
-            template=template_text,
-            input_variables=["context", "question"]
-        )
+        # Set up prompt template; custom templates are filled with str.format_map
+        self.prompt_template = prompt_template if prompt_template else self.DEFAULT_PROMPT_TEMPLATE
+        self._prompt_parts = None if prompt_template else self._DEFAULT_PROMPT_PARTS
         
-        # Initialize retriever from vector store
-        self._retriever = None
-        self._qa_chain = None
+        # Semantic cache of previous results keyed on query embeddings
+        self._cache = QueryCache(
+            similarity_threshold=cache_similarity_threshold,
+            max_entries=cache_max_entries
+        )
     
-    def _get_retriever(self):
+    def _search(self, query_embedding: List[float]) -> List[Document]:
         """
-        Get or create the retriever from vector store.
+        Run a vector similarity search for a query embedding.
         
+        Args:
+            query_embedding: Query embedding vector
+            
         Returns:
-            LangChain retriever instance
+            List of Document objects with metadata and scores
         """
-        if self._retriever is None:
-            langchain_store = self.vector_store_manager.get_langchain_store()
-            self._retriever = langchain_store.as_retriever(
-                search_kwargs={"k": self.retrieval_k}
-            )
-        return self._retriever
+        results = self.vector_store_manager.similarity_search(
+            query_vector=query_embedding,
+            k=self.retrieval_k
+        )
+        return self._to_documents(results)
     
-    def _get_qa_chain(self) -> RetrievalQA:
+    @staticmethod
+    def _to_documents(results: List[Dict[str, Any]]) -> List[Document]:
         """
-        Get or create the RetrievalQA chain.
+        Convert vector store search results to Document objects.
         
+        Args:
+            results: Search results from the vector store manager
+            
         Returns:
-            Configured RetrievalQA chain
+            List of Document objects with metadata and scores
         """
-        if self._qa_chain is None:
-            retriever = self._get_retriever()
-            self._qa_chain = RetrievalQA.from_chain_type(
-                llm=self.llm,
-                chain_type="stuff",
-                retriever=retriever,
-                return_source_documents=True,
-                chain_type_kwargs={"prompt": self.prompt}
+        return [
+            Document(
+                text=result.get('text', ''),
+                metadata=result.get('metadata', {}),
+                score=result.get('score', 0.0)
             )
-        return self._qa_chain
+            for result in results
+        ]
     
-    def get_relevant_documents(self, query: str) -> List[Document]:
+    def get_relevant_documents(
+        self,
+        query: str,
+        query_embedding: Optional[List[float]] = None
+    ) -> List[Document]:
         """
         Retrieve relevant documents for a query.
         
         Args:
             query: Query string
+            query_embedding: Precomputed embedding of the query, reused instead
+                of embedding the query again
             
         Returns:
             List of Document objects with metadata and scores
@@ -157,29 +216,92 @@ Answer:"""
             RAGChainError: If retrieval fails
         """
         try:
-            # Generate query embedding
-            query_embedding = self.embeddings.embed_query(query)
+            # Generate query embedding unless the caller already has one
+            if query_embedding is None:
+                query_embedding = self.embeddings.embed_query(query)
             
             # Perform similarity search
-            results = self.vector_store_manager.similarity_search(
-                query_vector=query_embedding,
+            return self._search(query_embedding)
+            
+        except Exception as e:
+            raise RAGChainError(f"Failed to retrieve documents: {str(e)}") from e
+    
+    def get_relevant_documents_batch(self, queries: List[str]) -> List[List[Document]]:
+        """
+        Retrieve relevant documents for several queries at once.
+        
+        All queries are embedded in one Bedrock call and searched in one
+        OpenSearch multi-search request, which suits query expansion and
+        cache warm-up.
+        
+        Args:
+            queries: Query strings
+            
+        Returns:
+            One list of Document objects per query, in the same order
+            
+        Raises:
+            RAGChainError: If retrieval fails
+        """
+        if not queries:
+            return []
+        
+        try:
+            query_embeddings = self.embeddings.embed_documents(queries)
+            
+            batch_results = self.vector_store_manager.similarity_search_batch(
+                query_vectors=query_embeddings,
                 k=self.retrieval_k
             )
             
-            # Convert to Document objects
-            documents = []
-            for result in results:
-                documents.append(Document(
-                    text=result.get('text', ''),
-                    metadata=result.get('metadata', {}),
-                    score=result.get('score', 0.0)
-                ))
-            
-            return documents
+            return [self._to_documents(results) for results in batch_results]
             
         except Exception as e:
             raise RAGChainError(f"Failed to retrieve documents: {str(e)}") from e
     
+    def _format_prompt(self, query: str, context: List[Document]) -> str:
+        """
+        Build the LLM prompt from the query and retrieved documents.
+        
+        Args:
+            query: Query string
+            context: List of Document objects to use as context
+            
+        Returns:
+            Formatted prompt string
+        """
+        # Format context from documents
+        buffer = io.StringIO()
+        for i, doc in enumerate(context, 1):
+            metadata = doc.metadata
+            buffer.write(
+                f"Document {i} (from {metadata.get('repo_url', 'unknown')}/"
+                f"{metadata.get('file_path', 'unknown')}):\n"
+            )
+            buffer.write(doc.text)
+            buffer.write("\n\n")
+        
+        # Drop the separator after the last document
+        context_text = buffer.getvalue()[:-2]
+        
+        # Format prompt by concatenation so placeholders in the inserted text are left alone
+        if self._prompt_parts is not None:
+            prefix, middle, suffix = self._prompt_parts
+            return f"{prefix}{context_text}{middle}{query}{suffix}"
+        
+        return self.prompt_template.format_map({
+            "context": context_text,
+            "question": query
+        })
+    
+    @staticmethod
+    def _response_text(response: Any) -> str:
+        """Extract text from an LLM response."""
+        if hasattr(response, 'content'):
+            return response.content
+        else:
+            return str(response)
+    
     def generate_response(self, query: str, context: List[Document]) -> str:
         """
         Generate response using LLM with provided context.
@@ -195,34 +317,113 @@ Answer:"""
             RAGChainError: If generation fails
         """
         try:
-            # Format context from documents
-            context_text = "\n\n".join([
-                f"Document {i+1} (from {doc.metadata.get('repo_url', 'unknown')}/{doc.metadata.get('file_path', 'unknown')}):\n{doc.text}"
-                for i, doc in enumerate(context)
-            ])
-            
-            # Format prompt
-            formatted_prompt = self.prompt.format(
-                context=context_text,
-                question=query
-            )
+            response = self.llm.invoke(self._format_prompt(query, context))
+            return self._response_text(response)
+                
+        except Exception as e:
+            raise RAGChainError(f"Failed to generate response: {str(e)}") from e
+    
+    def generate_response_stream(self, query: str, context: List[Document]) -> Iterator[str]:
+        """
+        Generate response using LLM, yielding text as it is produced.
+        
+        Args:
+            query: Query string
+            context: List of Document objects to use as context
             
-            # Generate response using LLM
-            response = self.llm.invoke(formatted_prompt)
+        Yields:
+            Response text fragments in order
             
-            # Extract text from response
-            if hasattr(response, 'content'):
-                return response.content
-            else:
-                return str(response)
+        Raises:
+            RAGChainError: If generation fails
+        """
+        try:
+            for chunk in self.llm.stream(self._format_prompt(query, context)):
+                text = self._response_text(chunk)
+                if text:
+                    yield text
                 
         except Exception as e:
             raise RAGChainError(f"Failed to generate response: {str(e)}") from e
     
+    async def agenerate_response(self, query: str, context: List[Document]) -> str:
+        """
+        Asynchronously generate response using LLM with provided context.
+        
+        Args:
+            query: Query string
+            context: List of Document objects to use as context
+            
+        Returns:
+            Generated response string
+            
+        Raises:
+            RAGChainError: If generation fails
+        """
+        try:
+            response = await self.llm.ainvoke(self._format_prompt(query, context))
+            return self._response_text(response)
+                
+        except Exception as e:
+            raise RAGChainError(f"Failed to generate response: {str(e)}") from e
+    
+    def _lookup_semantic(self, query: str, query_embedding: List[float]) -> Optional[_CachedResult]:
+        """
+        Look up a cached result for a semantically similar query.
+        
+        Hits are promoted into the exact tier so the next verbatim repeat
+        skips embedding.
+        """
+        cached = self._cache.lookup(query_embedding)
+        if cached is not None:
+            self._cache.insert_exact(query, cached)
+        return cached
+    
+    def _build_result(
+        self,
+        query: str,
+        query_embedding: List[float],
+        documents: List[Document],
+        answer: str
+    ) -> Dict[str, Any]:
+        """
+        Build the invoke result and store it in the cache.
+        
+        The cache keeps an immutable copy, so callers may modify the
+        returned dictionary without affecting later hits.
+        """
+        if not self._cache.enabled:
+            return {
+                "result": answer,
+                "source_documents": [
+                    {
+                        "text": doc.text,
+                        "metadata": doc.metadata,
+                        "score": doc.score
+                    }
+                    for doc in documents
+                ]
+            }
+        
+        entry = _CachedResult(
+            answer=answer,
+            sources=tuple(
+                (doc.text, MappingProxyType(dict(doc.metadata)), doc.score)
+                for doc in documents
+            )
+        )
+        self._cache.insert(query_embedding, entry)
+        self._cache.insert_exact(query, entry)
+        
+        return entry.to_result()
+    
     def invoke(self, query: str) -> Dict[str, Any]:
         """
         Execute the full RAG pipeline for a query.
         
+        Results for repeated or semantically similar queries are served from
+        the cache without invoking retrieval or the LLM.
+        
         Args:
             query: Query string
             
@@ -235,28 +436,117 @@ Answer:"""
             RAGChainError: If invocation fails
         """
         try:
-            qa_chain = self._get_qa_chain()
+            if self._cache.enabled:
+                # Exact repeats skip the embedding call entirely
+                cached = self._cache.lookup_exact(query)
+                if cached is not None:
+                    return cached.to_result()
             
-            # Execute the chain
-            result = qa_chain.invoke({"query": query})
+            # The query is embedded once and shared by the cache and retrieval
+            query_embedding = self.embeddings.embed_query(query)
             
-            # Extract and format results
-            answer = result.get("result", "")
-            source_docs = result.get("source_documents", [])
+            if self._cache.enabled:
+                cached = self._lookup_semantic(query, query_embedding)
+                if cached is not None:
+                    return cached.to_result()
             
-            # Convert LangChain documents to our Document format
-            formatted_sources = []
-            for doc in source_docs:
-                formatted_sources.append({
-                    "text": doc.page_content,
-                    "metadata": doc.metadata,
-                    "score": doc.metadata.get("score", 0.0)
-                })
+            documents = self._search(query_embedding)
+            answer = self.generate_response(query, documents)
             
-            return {
-                "result": answer,
-                "source_documents": formatted_sources
-            }
+            return self._build_result(query, query_embedding, documents, answer)
+            
+        except RAGChainError:
+            raise
+        except Exception as e:
+            raise RAGChainError(f"Failed to invoke RAG chain: {str(e)}") from e
+    
+    async def ainvoke(self, query: str) -> Dict[str, Any]:
+        """
+        Asynchronously execute the full RAG pipeline for a query.
+        
+        Behaves like invoke, but awaits the embedding, search, and LLM calls
+        so several queries can be processed concurrently on one event loop.
+        
+        Args:
+            query: Query string
+            
+        Returns:
+            Dictionary containing:
+                - result: Generated answer
+                - source_documents: List of source documents used
+                
+        Raises:
+            RAGChainError: If invocation fails
+        """
+        try:
+            if self._cache.enabled:
+                cached = self._cache.lookup_exact(query)
+                if cached is not None:
+                    return cached.to_result()
+            
+            query_embedding = await self.embeddings.aembed_query(query)
+            
+            if self._cache.enabled:
+                cached = self._lookup_semantic(query, query_embedding)
+                if cached is not None:
+                    return cached.to_result()
+            
+            results = await self.vector_store_manager.asimilarity_search(
+                query_vector=query_embedding,
+                k=self.retrieval_k
+            )
+            documents = self._to_documents(results)
+            answer = await self.agenerate_response(query, documents)
+            
+            return self._build_result(query, query_embedding, documents, answer)
+            
+        except RAGChainError:
+            raise
+        except Exception as e:
+            raise RAGChainError(f"Failed to invoke RAG chain: {str(e)}") from e
+    
+    def invoke_stream(self, query: str) -> Iterator[str]:
+        """
+        Execute the RAG pipeline for a query, streaming the generated answer.
+        
+        Retrieval completes before the first fragment is yielded. Once the
+        stream is exhausted the full result is cached, so a later invoke of
+        the same query is served from the cache.
+        
+        Args:
+            query: Query string
+            
+        Yields:
+            Answer text fragments in order
+            
+        Raises:
+            RAGChainError: If invocation fails
+        """
+        try:
+            if self._cache.enabled:
+                cached = self._cache.lookup_exact(query)
+                if cached is not None:
+                    yield cached.answer
+                    return
+            
+            query_embedding = self.embeddings.embed_query(query)
+            
+            if self._cache.enabled:
+                cached = self._lookup_semantic(query, query_embedding)
+                if cached is not None:
+                    yield cached.answer
+                    return
+            
+            documents = self._search(query_embedding)
+            
+            fragments = []
+            for text in self.generate_response_stream(query, documents):
+                fragments.append(text)
+                yield text
+            
+            self._build_result(query, query_embedding, documents, "".join(fragments))
             
+        except RAGChainError:
+            raise
         except Exception as e:
             raise RAGChainError(f"Failed to invoke RAG chain: {str(e)}") from e
@@ -4,12 +4,34 @@ import json
 import logging
 import os
 import sys
-from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 from functools import wraps
 import time
 
 
+# LogRecord attributes that are not user-supplied context fields
+_SKIP_ATTRS = frozenset({
+    'name', 'msg', 'args', 'created', 'filename', 'funcName',
+    'levelname', 'levelno', 'lineno', 'module', 'msecs',
+    'message', 'pathname', 'process', 'processName',
+    'relativeCreated', 'thread', 'threadName', 'exc_info',
+    'exc_text', 'stack_info', 'component', 'request_id', 'timestamp'
+})
+
+
+def utc_timestamp() -> str:
+    """
+    Get the current time as an ISO 8601 UTC timestamp.
+    
+    Formats time.time() directly rather than allocating a datetime.
+    
+    Returns:
+        Timestamp with microsecond precision, e.g. 2024-01-01T00:00:00.123456Z
+    """
+    now = time.time()
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now)) + f".{int(now % 1 * 1e6):06d}Z"
+
+
 class StructuredLogger:
     """
     Structured logger that outputs JSON-formatted logs for CloudWatch.
@@ -66,9 +88,13 @@ class StructuredLogger:
             message: Log message
             **kwargs: Additional context fields
         """
+        # Skip building the record context for levels that would be dropped
+        if not self.logger.isEnabledFor(level):
+            return
+        
         extra = {
             'component': self.component,
-            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'timestamp': utc_timestamp(),
             **kwargs
         }
         
@@ -101,6 +127,28 @@ class StructuredLogger:
 class JsonFormatter(logging.Formatter):
     """JSON formatter for structured logging."""
     
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        # Second-resolution timestamp prefix, reused by records in the same second
+        self._cached_second: Optional[int] = None
+        self._cached_prefix = ''
+    
+    def _format_timestamp(self, record: logging.LogRecord) -> str:
+        """
+        Format the record creation time as an ISO 8601 UTC timestamp.
+        
+        Args:
+            record: Log record
+            
+        Returns:
+            Timestamp with millisecond precision, e.g. 2024-01-01T00:00:00.123Z
+        """
+        second = int(record.created)
+        if second != self._cached_second:
+            self._cached_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._cached_second = second
+        return f"{self._cached_prefix}.{int(record.msecs):03d}Z"
+    
     def format(self, record: logging.LogRecord) -> str:
         """
         Format log record as JSON.
@@ -112,7 +160,7 @@ class JsonFormatter(logging.Formatter):
             JSON-formatted log string
         """
         log_data = {
-            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'timestamp': self._format_timestamp(record),
             'level': record.levelname,
             'message': record.getMessage(),
             'logger': record.name
@@ -127,11 +175,7 @@ class JsonFormatter(logging.Formatter):
         
         # Add any additional fields from extra parameter
         for key, value in record.__dict__.items():
-            if key not in ['name', 'msg', 'args', 'created', 'filename', 'funcName',
-                          'levelname', 'levelno', 'lineno', 'module', 'msecs',
-                          'message', 'pathname', 'process', 'processName',
-                          'relativeCreated', 'thread', 'threadName', 'exc_info',
-                          'exc_text', 'stack_info', 'component', 'request_id', 'timestamp']:
+            if key not in _SKIP_ATTRS:
                 log_data[key] = value
         
         # Add exception info if present
@@ -1,13 +1,245 @@
 """CloudWatch custom metrics utilities for Archon system."""
 
+import atexit
+import functools
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, List, Optional, Any, Tuple
 from dataclasses import dataclass
 import os
 
 
-@dataclass
+# PutMetricData accepts up to 1000 datums and a 1 MB request payload per call
+MAX_BATCH_SIZE = 1000
+MAX_PAYLOAD_BYTES = 1_000_000
+
+# A datum can carry at most 150 distinct values in Values/Counts
+MAX_VALUES_PER_DATUM = 150
+
+# Aggregation key: (metric name, caller dimensions, unit); Environment is added on publish
+MetricKey = Tuple[str, FrozenSet[Tuple[str, str]], str]
+
+# Dimension key for metrics recorded without caller dimensions
+_NO_DIMENSIONS: FrozenSet[Tuple[str, str]] = frozenset()
+
+
+@functools.lru_cache(maxsize=512)
+def _metric_key(
+    name: str,
+    unit: str,
+    dimension_name: Optional[str] = None,
+    dimension_value: Optional[str] = None
+) -> MetricKey:
+    """
+    Build the aggregation key for a metric with at most one dimension.
+    
+    Cached so recorders with a dimension build each key once per value.
+    
+    Args:
+        name: Metric name
+        unit: Metric unit
+        dimension_name: Optional dimension name
+        dimension_value: Dimension value (the dimension is omitted when empty)
+        
+    Returns:
+        Metric key
+    """
+    if dimension_name and dimension_value:
+        return (name, frozenset(((dimension_name, dimension_value),)), unit)
+    return (name, _NO_DIMENSIONS, unit)
+
+
+# Background publishing defaults
+DEFAULT_FLUSH_INTERVAL = 2.0
+DEFAULT_MAX_QUEUE_SIZE = 10_000
+DEFAULT_CLOSE_TIMEOUT = 5.0
+
+# CloudWatch client settings: keep-alive connections and adaptive retries with jitter
+CLOUDWATCH_CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={'max_attempts': 3, 'mode': 'adaptive'}
+)
+
+# Parallel PutMetricData calls per flush, the per-region call rate limit, and the wait for a flush
+FLUSH_WORKERS = 4
+PUT_METRIC_DATA_TPS = 150
+FLUSH_TIMEOUT = 30.0
+
+# Attempts per PutMetricData call when CloudWatch throttles, and the backoff base in seconds
+MAX_PUT_ATTEMPTS = 5
+RETRY_BACKOFF_BASE = 0.1
+
+# Error codes that are retried with backoff
+_THROTTLING_ERROR_CODES = frozenset({'Throttling', 'ThrottlingException', 'RequestLimitExceeded'})
+
+# Embedded Metric Format limits: metrics per document and values per metric
+EMF_MAX_METRICS = 100
+EMF_MAX_VALUES = 100
+
+# Metrics backend selected by get_metrics_publisher: 'emf' (log lines) or 'api' (PutMetricData)
+METRICS_MODE_EMF = 'emf'
+METRICS_MODE_API = 'api'
+
+# Queue sentinel that stops the worker thread
+_STOP = object()
+
+# Publishers with a running worker thread, closed at interpreter exit. Held
+# weakly so registering for exit does not keep a publisher alive.
+_live_publishers: "weakref.WeakSet[MetricsPublisher]" = weakref.WeakSet()
+
+
+def _close_live_publishers() -> None:
+    """Publish remaining metrics from every live publisher at exit."""
+    for publisher in list(_live_publishers):
+        publisher.close()
+
+
+atexit.register(_close_live_publishers)
+
+# Flush before the estimated payload gets this large, leaving room for the request envelope
+_PAYLOAD_FLUSH_BYTES = MAX_PAYLOAD_BYTES * 9 // 10
+
+# Estimated encoded size of a datum's fixed fields, each dimension, and each value/count pair
+_DATUM_OVERHEAD_BYTES = 200
+_DIMENSION_OVERHEAD_BYTES = 100
+_VALUE_OVERHEAD_BYTES = 80
+
+
+def _estimate_datum_bytes(name: str, dimensions: Iterable[Tuple[str, str]], value_count: int = 1) -> int:
+    """
+    Estimate the encoded size of a metric datum in a PutMetricData request.
+    
+    Args:
+        name: Metric name
+        dimensions: Metric dimension name/value pairs
+        value_count: Number of value/count pairs in the datum
+        
+    Returns:
+        Approximate size in bytes
+    """
+    size = _DATUM_OVERHEAD_BYTES + len(name) + _VALUE_OVERHEAD_BYTES * value_count
+    for key, value in dimensions:
+        size += _DIMENSION_OVERHEAD_BYTES + len(key) + len(value)
+    return size
+
+
+logger = logging.getLogger(__name__)
+
+# Most recent (epoch second, datetime) pair; CloudWatch stores timestamps at one-second resolution
+_clock_cache: Tuple[int, Optional[datetime]] = (-1, None)
+
+
+def _coarse_now() -> datetime:
+    """
+    Get the current UTC time truncated to the second.
+    
+    The datetime is built once per second and reused.
+    
+    Returns:
+        Timezone-aware UTC datetime
+    """
+    global _clock_cache
+    
+    second = int(time.time())
+    cached_second, cached = _clock_cache
+    if second != cached_second:
+        cached = datetime.fromtimestamp(second, tz=timezone.utc)
+        _clock_cache = (second, cached)
+    return cached
+
+
+def _to_datum(
+    name: str,
+    unit: str,
+    dimensions: List[Dict[str, str]],
+    values: List[float],
+    timestamp: datetime
+) -> Dict[str, Any]:
+    """
+    Build one CloudWatch datum from all values recorded for a metric key.
+    
+    Values are sent as Values/Counts when there are at most
+    MAX_VALUES_PER_DATUM distinct values, otherwise as StatisticValues.
+    
+    Args:
+        name: Metric name
+        unit: Metric unit
+        dimensions: CloudWatch-format dimensions list
+        values: Recorded values
+        timestamp: Timestamp of the most recent value
+        
+    Returns:
+        PutMetricData datum
+    """
+    datum: Dict[str, Any] = {
+        'MetricName': name,
+        'Unit': unit,
+        'Timestamp': timestamp,
+        'Dimensions': dimensions
+    }
+    
+    if len(values) == 1:
+        datum['Value'] = values[0]
+        return datum
+    
+    counts = Counter(values)
+    if len(counts) <= MAX_VALUES_PER_DATUM:
+        datum['Values'] = list(counts.keys())
+        datum['Counts'] = [float(count) for count in counts.values()]
+    else:
+        datum['StatisticValues'] = {
+            'SampleCount': float(len(values)),
+            'Sum': float(sum(values)),
+            'Minimum': float(min(values)),
+            'Maximum': float(max(values))
+        }
+    
+    return datum
+
+
+class _TokenBucket:
+    """Blocking token bucket that limits calls to a steady rate with bursts up to the rate."""
+    
+    def __init__(self, rate: float):
+        """
+        Initialize the token bucket.
+        
+        Args:
+            rate: Tokens added per second, also the bucket capacity
+        """
+        self.rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Take one token, sleeping until one is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_seconds = (1 - self._tokens) / self.rate
+            time.sleep(wait_seconds)
+
+
+@dataclass(slots=True)
 class MetricData:
     """Represents a CloudWatch metric data point."""
     name: str
@@ -28,11 +260,29 @@ class MetricsPublisher:
     - Performance metrics
     """
     
+    # Keys for the dimensionless record_* metrics, built once
+    _REPOSITORIES_CHECKED_KEY = _metric_key('RepositoriesChecked', 'Count')
+    _DOCUMENTS_UPDATED_KEY = _metric_key('DocumentsUpdated', 'Count')
+    _MONITORING_DURATION_KEY = _metric_key('MonitoringDuration', 'Seconds')
+    _EMBEDDINGS_GENERATED_KEY = _metric_key('EmbeddingsGenerated', 'Count')
+    _EMBEDDING_GENERATION_TIME_KEY = _metric_key('EmbeddingGenerationTime', 'Seconds')
+    _EMBEDDING_RETRIES_KEY = _metric_key('EmbeddingRetries', 'Count')
+    _QUERIES_PROCESSED_KEY = _metric_key('QueriesProcessed', 'Count')
+    _QUERY_LATENCY_KEY = _metric_key('QueryLatency', 'Seconds')
+    _DOCUMENTS_RETRIEVED_KEY = _metric_key('DocumentsRetrieved', 'Count')
+    _LLM_INVOCATION_TIME_KEY = _metric_key('LLMInvocationTime', 'Seconds')
+    _GITHUB_API_CALLS_KEY = _metric_key('GitHubAPICalls', 'Count')
+    _GITHUB_RATE_LIMIT_REMAINING_KEY = _metric_key('GitHubRateLimitRemaining', 'Count')
+    _DYNAMODB_THROTTLES_KEY = _metric_key('DynamoDBThrottles', 'Count')
+    
     def __init__(
         self,
         namespace: str = 'Archon',
         environment: Optional[str] = None,
-        cloudwatch_client=None
+        cloudwatch_client=None,
+        auto_flush_threshold: int = MAX_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE
     ):
         """
         Initialize metrics publisher.
@@ -41,11 +291,37 @@ class MetricsPublisher:
             namespace: CloudWatch namespace for metrics
             environment: Environment name (dev, staging, prod)
             cloudwatch_client: Optional boto3 CloudWatch client (for testing)
+            auto_flush_threshold: Number of batched metrics that triggers a flush
+            flush_interval: Seconds between background flushes
+            max_queue_size: Maximum metrics waiting to be batched before new ones are dropped
         """
         self.namespace = namespace
         self.environment = environment or os.environ.get('ENVIRONMENT', 'dev')
-        self._cloudwatch = cloudwatch_client or boto3.client('cloudwatch')
-        self._batch: List[MetricData] = []
+        self._cloudwatch = cloudwatch_client or self._create_cloudwatch_client()
+        self.auto_flush_threshold = min(auto_flush_threshold, MAX_BATCH_SIZE)
+        self.flush_interval = flush_interval
+        
+        # Metrics are queued by callers and batched by the worker thread
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue_size)
+        self._dropped = 0
+        self._worker: Optional[threading.Thread] = None
+        
+        # Guards worker startup and the dropped count, which caller and flush threads both update
+        self._lock = threading.Lock()
+        
+        # Values aggregated per metric key, owned by whichever thread is draining the queue
+        self._agg: Dict[MetricKey, List[Any]] = {}
+        
+        # CloudWatch-format dimension lists, built once per distinct dimension set
+        self._dim_cache: Dict[FrozenSet[Tuple[str, str]], List[Dict[str, str]]] = {}
+        
+        # Pool for publishing multi-call flushes in parallel, created on first use
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._rate_limiter = _TokenBucket(PUT_METRIC_DATA_TPS)
+    
+    def _create_cloudwatch_client(self) -> Any:
+        """Create the CloudWatch client used when none is injected."""
+        return boto3.client('cloudwatch', config=CLOUDWATCH_CLIENT_CONFIG)
     
     def put_metric(
         self,
@@ -56,263 +332,504 @@ class MetricsPublisher:
         timestamp: Optional[datetime] = None
     ) -> None:
         """
-        Add a metric to the batch.
+        Queue a metric for publishing.
+        
+        Never blocks on CloudWatch; if the queue is full the metric is
+        dropped and counted in a MetricsDropped metric.
         
         Args:
             name: Metric name
             value: Metric value
             unit: Metric unit (Count, Seconds, Bytes, etc.)
-            dimensions: Optional metric dimensions
+            dimensions: Optional metric dimensions (Environment is always added)
             timestamp: Optional timestamp (defaults to now)
         """
-        if dimensions is None:
-            dimensions = {}
+        key = (name, frozenset(dimensions.items()) if dimensions else _NO_DIMENSIONS, unit)
+        self._emit(key, value, timestamp)
+    
+    def _emit(self, key: MetricKey, value: float, timestamp: Optional[datetime] = None) -> None:
+        """
+        Queue a metric under a prebuilt key.
+        
+        Fast path for the record_* helpers, which skip keyword binding and
+        dimension hashing by passing keys built once per metric.
+        
+        Args:
+            key: Metric key from _metric_key
+            value: Metric value
+            timestamp: Optional timestamp (defaults to now)
+        """
+        self._ensure_worker()
         
-        # Add environment dimension
-        dimensions['Environment'] = self.environment
+        try:
+            self._queue.put_nowait((key, value, timestamp or _coarse_now()))
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+    
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """
+        Publish all queued metrics to CloudWatch and wait for completion.
+        
+        Lambda freezes background threads between invocations, so handlers
+        must call this before returning or queued metrics may be lost.
+        
+        Args:
+            timeout: Optional maximum seconds to wait for the worker
+        """
+        if self._worker is None or not self._worker.is_alive():
+            # No worker running, so drain on the calling thread
+            self._drain_pending()
+            self._publish()
+            return
+        
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+    
+    def close(self, timeout: float = DEFAULT_CLOSE_TIMEOUT) -> None:
+        """
+        Publish remaining metrics and stop the worker thread.
         
-        metric = MetricData(
-            name=name,
-            value=value,
-            unit=unit,
-            dimensions=dimensions,
-            timestamp=timestamp or datetime.now(timezone.utc)
-        )
+        Called at interpreter exit for every publisher whose worker is running.
         
-        self._batch.append(metric)
+        Args:
+            timeout: Maximum seconds to wait for the worker to finish
+        """
+        _live_publishers.discard(self)
         
-        # Auto-flush if batch is large
-        if len(self._batch) >= 20:
+        worker = self._worker
+        if worker is None or not worker.is_alive():
             self.flush()
+        else:
+            self._queue.put(_STOP)
+            worker.join(timeout)
+        
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
     
-    def flush(self) -> None:
-        """Publish all batched metrics to CloudWatch."""
-        if not self._batch:
+    def _ensure_worker(self) -> None:
+        """Start the background worker thread on first use."""
+        if self._worker is not None:
             return
         
-        try:
-            # Convert to CloudWatch format
-            metric_data = []
-            for metric in self._batch:
-                data_point = {
-                    'MetricName': metric.name,
-                    'Value': metric.value,
-                    'Unit': metric.unit,
-                    'Timestamp': metric.timestamp
-                }
-                
-                if metric.dimensions:
-                    data_point['Dimensions'] = [
-                        {'Name': k, 'Value': v}
-                        for k, v in metric.dimensions.items()
-                    ]
-                
-                metric_data.append(data_point)
+        with self._lock:
+            if self._worker is None:
+                # The worker holds the publisher weakly, so an unreferenced publisher
+                # can be collected and its worker exits at the next wakeup
+                worker = threading.Thread(
+                    target=self._drain_loop,
+                    args=(weakref.ref(self), self._queue, self.flush_interval),
+                    name='metrics-publisher',
+                    daemon=True
+                )
+                worker.start()
+                self._worker = worker
+                _live_publishers.add(self)
+    
+    @staticmethod
+    def _drain_loop(
+        publisher_ref: "weakref.ref[MetricsPublisher]",
+        work_queue: "queue.Queue[Any]",
+        flush_interval: float
+    ) -> None:
+        """
+        Batch queued metrics and publish them every flush_interval seconds.
+        
+        Args:
+            publisher_ref: Weak reference to the owning publisher
+            work_queue: The publisher's metric queue
+            flush_interval: Seconds between flushes
+        """
+        deadline = time.monotonic() + flush_interval
+        
+        while True:
+            try:
+                item = work_queue.get(timeout=max(deadline - time.monotonic(), 0.0))
+            except queue.Empty:
+                item = None
             
-            # Publish to CloudWatch (max 20 metrics per call)
-            for i in range(0, len(metric_data), 20):
-                batch = metric_data[i:i+20]
-                self._cloudwatch.put_metric_data(
-                    Namespace=self.namespace,
-                    MetricData=batch
+            publisher = publisher_ref()
+            if publisher is None:
+                return
+            
+            if item is _STOP:
+                publisher._publish()
+                return
+            
+            if isinstance(item, threading.Event):
+                # Flush request from flush()
+                publisher._publish()
+                item.set()
+            elif item is not None:
+                publisher._add(*item)
+            
+            if time.monotonic() >= deadline:
+                publisher._publish()
+                deadline = time.monotonic() + flush_interval
+            
+            # Drop the strong reference before blocking on the queue again
+            del publisher
+    
+    def _drain_pending(self) -> None:
+        """Move all queued metrics into the batch on the calling thread."""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is not _STOP:
+                self._add(*item)
+    
+    def _add(self, key: MetricKey, value: float, timestamp: datetime) -> None:
+        """
+        Aggregate a value into its metric key's bucket.
+        
+        Args:
+            key: Metric name, dimensions, and unit
+            value: Metric value
+            timestamp: Metric timestamp
+        """
+        bucket = self._agg.get(key)
+        if bucket is None:
+            self._agg[key] = [[value], timestamp]
+            
+            # Publish once there is a full call's worth of datums
+            if len(self._agg) >= self.auto_flush_threshold:
+                self._publish()
+        else:
+            bucket[0].append(value)
+            if timestamp > bucket[1]:
+                bucket[1] = timestamp
+    
+    def _dimensions(self, dimension_key: FrozenSet[Tuple[str, str]]) -> List[Dict[str, str]]:
+        """
+        Get the CloudWatch-format dimensions for a dimension set, with Environment added.
+        
+        Args:
+            dimension_key: Caller-supplied dimension name/value pairs
+            
+        Returns:
+            Cached dimensions list; callers must not mutate it
+        """
+        dimensions = self._dim_cache.get(dimension_key)
+        if dimensions is None:
+            merged = {**dict(dimension_key), 'Environment': self.environment}
+            dimensions = [{'Name': k, 'Value': v} for k, v in merged.items()]
+            self._dim_cache[dimension_key] = dimensions
+        return dimensions
+    
+    def _add_dropped(self) -> None:
+        """Move the dropped-metric count into a MetricsDropped metric."""
+        with self._lock:
+            dropped, self._dropped = self._dropped, 0
+        if dropped:
+            self._add(
+                ('MetricsDropped', _NO_DIMENSIONS, 'Count'),
+                dropped,
+                _coarse_now()
+            )
+    
+    def _publish(self) -> None:
+        """Publish the aggregated metrics to CloudWatch."""
+        self._add_dropped()
+        
+        if not self._agg:
+            return
+        
+        try:
+            # Convert to CloudWatch format, splitting into calls that stay within API limits
+            calls: List[List[Dict[str, Any]]] = []
+            metric_data: List[Dict[str, Any]] = []
+            payload_bytes = 0
+            for (name, dimension_key, unit), (values, timestamp) in self._agg.items():
+                dimensions = self._dimensions(dimension_key)
+                datum = _to_datum(name, unit, dimensions, values, timestamp)
+                datum_bytes = _estimate_datum_bytes(
+                    name,
+                    ((dimension['Name'], dimension['Value']) for dimension in dimensions),
+                    len(datum.get('Values', ())) or 1
                 )
+                if metric_data and (
+                    len(metric_data) >= MAX_BATCH_SIZE
+                    or payload_bytes + datum_bytes > _PAYLOAD_FLUSH_BYTES
+                ):
+                    calls.append(metric_data)
+                    metric_data = []
+                    payload_bytes = 0
+                payload_bytes += datum_bytes
+                metric_data.append(datum)
+            calls.append(metric_data)
             
-            # Clear batch
-            self._batch = []
+            # Publish to CloudWatch (max MAX_BATCH_SIZE metrics per call), in parallel when split
+            if len(calls) == 1:
+                self._put_metric_data(calls[0])
+            else:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=FLUSH_WORKERS,
+                        thread_name_prefix='cw-flush'
+                    )
+                futures = [self._executor.submit(self._put_metric_data, batch) for batch in calls]
+                done, _ = wait(futures, timeout=FLUSH_TIMEOUT)
+                for future in done:
+                    future.result()
             
         except Exception as e:
             # Log error but don't fail the operation
-            print(f"Failed to publish metrics: {str(e)}")
-            self._batch = []
+            logger.warning("Failed to publish metrics: %s", e)
+        
+        self._agg.clear()
+    
+    def _put_metric_data(self, metric_data: List[Dict[str, Any]]) -> None:
+        """
+        Send one PutMetricData call, waiting for the rate limiter first.
+        
+        Throttled calls are retried with jittered exponential backoff up to
+        MAX_PUT_ATTEMPTS times. Datums from a call that still fails are
+        counted in the next MetricsDropped metric.
+        
+        Args:
+            metric_data: Datums for a single call
+        """
+        for attempt in range(MAX_PUT_ATTEMPTS):
+            self._rate_limiter.acquire()
+            try:
+                self._cloudwatch.put_metric_data(
+                    Namespace=self.namespace,
+                    MetricData=metric_data
+                )
+                return
+                
+            except ClientError as e:
+                error_code = e.response.get('Error', {}).get('Code', '')
+                if error_code in _THROTTLING_ERROR_CODES and attempt < MAX_PUT_ATTEMPTS - 1:
+                    time.sleep(random.uniform(0, 2 ** attempt) * RETRY_BACKOFF_BASE)
+                    continue
+                logger.warning("Failed to publish %d metrics: %s", len(metric_data), e)
+                break
+                
+            except Exception as e:
+                logger.warning("Failed to publish %d metrics: %s", len(metric_data), e)
+                break
+        
+        with self._lock:
+            self._dropped += len(metric_data)
     
     # Document monitoring metrics
     
     def record_repositories_checked(self, count: int) -> None:
         """Record number of repositories checked."""
-        self.put_metric(
-            name='RepositoriesChecked',
-            value=count,
-            unit='Count'
-        )
+        self._emit(self._REPOSITORIES_CHECKED_KEY, count)
     
     def record_documents_processed(self, count: int, repo: Optional[str] = None) -> None:
         """Record number of documents processed."""
-        dimensions = {}
-        if repo:
-            dimensions['Repository'] = repo
-        
-        self.put_metric(
-            name='DocumentsProcessed',
-            value=count,
-            unit='Count',
-            dimensions=dimensions
-        )
+        self._emit(_metric_key('DocumentsProcessed', 'Count', 'Repository', repo), count)
     
     def record_documents_updated(self, count: int) -> None:
         """Record number of documents updated in vector store."""
-        self.put_metric(
-            name='DocumentsUpdated',
-            value=count,
-            unit='Count'
-        )
+        self._emit(self._DOCUMENTS_UPDATED_KEY, count)
     
     def record_monitoring_errors(self, count: int, error_type: Optional[str] = None) -> None:
         """Record monitoring errors."""
-        dimensions = {}
-        if error_type:
-            dimensions['ErrorType'] = error_type
-        
-        self.put_metric(
-            name='MonitoringErrors',
-            value=count,
-            unit='Count',
-            dimensions=dimensions
-        )
+        self._emit(_metric_key('MonitoringErrors', 'Count', 'ErrorType', error_type), count)
     
     def record_monitoring_duration(self, duration_seconds: float) -> None:
         """Record monitoring execution duration."""
-        self.put_metric(
-            name='MonitoringDuration',
-            value=duration_seconds,
-            unit='Seconds'
-        )
+        self._emit(self._MONITORING_DURATION_KEY, duration_seconds)
     
     # Embedding generation metrics
     
     def record_embeddings_generated(self, count: int) -> None:
         """Record number of embeddings generated."""
-        self.put_metric(
-            name='EmbeddingsGenerated',
-            value=count,
-            unit='Count'
-        )
+        self._emit(self._EMBEDDINGS_GENERATED_KEY, count)
     
     def record_embedding_generation_time(self, duration_seconds: float) -> None:
         """Record embedding generation time."""
-        self.put_metric(
-            name='EmbeddingGenerationTime',
-            value=duration_seconds,
-            unit='Seconds'
-        )
+        self._emit(self._EMBEDDING_GENERATION_TIME_KEY, duration_seconds)
     
     def record_embedding_retries(self, count: int) -> None:
         """Record number of embedding generation retries."""
-        self.put_metric(
-            name='EmbeddingRetries',
-            value=count,
-            unit='Count'
-        )
+        self._emit(self._EMBEDDING_RETRIES_KEY, count)
     
     # Query processing metrics
     
     def record_queries_processed(self, count: int = 1) -> None:
         """Record number of queries processed."""
-        self.put_metric(
-            name='QueriesProcessed',
-            value=count,
-            unit='Count'
-        )
+        self._emit(self._QUERIES_PROCESSED_KEY, count)
     
     def record_query_latency(self, duration_seconds: float) -> None:
         """Record query processing latency."""
-        self.put_metric(
-            name='QueryLatency',
-            value=duration_seconds,
-            unit='Seconds'
-        )
+        self._emit(self._QUERY_LATENCY_KEY, duration_seconds)
     
     def record_query_errors(self, count: int = 1, error_type: Optional[str] = None) -> None:
         """Record query processing errors."""
-        dimensions = {}
-        if error_type:
-            dimensions['ErrorType'] = error_type
-        
-        self.put_metric(
-            name='QueryErrors',
-            value=count,
-            unit='Count',
-            dimensions=dimensions
-        )
+        self._emit(_metric_key('QueryErrors', 'Count', 'ErrorType', error_type), count)
     
     def record_documents_retrieved(self, count: int) -> None:
         """Record number of documents retrieved for a query."""
-        self.put_metric(
-            name='DocumentsRetrieved',
-            value=count,
-            unit='Count'
-        )
+        self._emit(self._DOCUMENTS_RETRIEVED_KEY, count)
     
     def record_llm_invocation_time(self, duration_seconds: float) -> None:
         """Record LLM invocation time."""
-        self.put_metric(
-            name='LLMInvocationTime',
-            value=duration_seconds,
-            unit='Seconds'
-        )
+        self._emit(self._LLM_INVOCATION_TIME_KEY, duration_seconds)
     
     # Vector store metrics
     
     def record_vector_store_operations(self, operation: str, count: int = 1) -> None:
         """Record vector store operations."""
-        self.put_metric(
-            name='VectorStoreOperations',
-            value=count,
-            unit='Count',
-            dimensions={'Operation': operation}
-        )
+        self._emit(_metric_key('VectorStoreOperations', 'Count', 'Operation', operation), count)
     
     def record_vector_store_latency(self, operation: str, duration_seconds: float) -> None:
         """Record vector store operation latency."""
-        self.put_metric(
-            name='VectorStoreLatency',
-            value=duration_seconds,
-            unit='Seconds',
-            dimensions={'Operation': operation}
-        )
+        self._emit(_metric_key('VectorStoreLatency', 'Seconds', 'Operation', operation), duration_seconds)
     
     # GitHub API metrics
     
     def record_github_api_calls(self, count: int = 1) -> None:
         """Record GitHub API calls."""
-        self.put_metric(
-            name='GitHubAPICalls',
-            value=count,
-            unit='Count'
-        )
+        self._emit(self._GITHUB_API_CALLS_KEY, count)
     
     def record_github_rate_limit_remaining(self, remaining: int) -> None:
         """Record GitHub API rate limit remaining."""
-        self.put_metric(
-            name='GitHubRateLimitRemaining',
-            value=remaining,
-            unit='Count'
-        )
+        self._emit(self._GITHUB_RATE_LIMIT_REMAINING_KEY, remaining)
     
     # DynamoDB metrics
     
     def record_dynamodb_operations(self, operation: str, count: int = 1) -> None:
         """Record DynamoDB operations."""
-        self.put_metric(
-            name='DynamoDBOperations',
-            value=count,
-            unit='Count',
-            dimensions={'Operation': operation}
-        )
+        self._emit(_metric_key('DynamoDBOperations', 'Count', 'Operation', operation), count)
     
     def record_dynamodb_throttles(self, count: int = 1) -> None:
         """Record DynamoDB throttling events."""
-        self.put_metric(
-            name='DynamoDBThrottles',
-            value=count,
-            unit='Count'
-        )
+        self._emit(self._DYNAMODB_THROTTLES_KEY, count)
+
+
+class EMFMetricsPublisher(MetricsPublisher):
+    """
+    Publisher that writes metrics as CloudWatch Embedded Metric Format logs.
+    
+    Each flush writes JSON documents to stdout, which Lambda forwards to
+    CloudWatch Logs where the metrics are extracted. There are no
+    PutMetricData calls, so publishing needs no CloudWatch client and is
+    not subject to API throttling.
+    """
+    
+    def __init__(self, *args, stream: Optional[Any] = None, **kwargs):
+        """
+        Initialize EMF metrics publisher.
+        
+        Args:
+            *args: Positional arguments for MetricsPublisher
+            stream: Optional text stream for EMF documents (defaults to stdout)
+            **kwargs: Keyword arguments for MetricsPublisher
+        """
+        super().__init__(*args, **kwargs)
+        self._stream = stream
+    
+    def _create_cloudwatch_client(self) -> Any:
+        """EMF publishing does not call the CloudWatch API."""
+        return None
+    
+    def _publish(self) -> None:
+        """Write the aggregated metrics as EMF log lines."""
+        self._add_dropped()
+        
+        if not self._agg:
+            return
+        
+        try:
+            # Metrics sharing a dimension set share a document; values live at the top level
+            groups: Dict[FrozenSet[Tuple[str, str]], List[Tuple[str, str, List[float], datetime]]] = {}
+            for (name, dimension_key, unit), (values, timestamp) in self._agg.items():
+                groups.setdefault(dimension_key, []).append((name, unit, values, timestamp))
+            
+            stream = self._stream or sys.stdout
+            for dimension_key, metrics in groups.items():
+                for start in range(0, len(metrics), EMF_MAX_METRICS):
+                    for line in self._emf_documents(dimension_key, metrics[start:start + EMF_MAX_METRICS]):
+                        stream.write(line + '\n')
+            stream.flush()
+            
+        except Exception as e:
+            # Log error but don't fail the operation
+            logger.warning("Failed to publish metrics: %s", e)
+        
+        self._agg.clear()
+    
+    def _emf_documents(
+        self,
+        dimension_key: FrozenSet[Tuple[str, str]],
+        metrics: List[Tuple[str, str, List[float], datetime]]
+    ) -> Iterable[str]:
+        """
+        Serialize metrics that share a dimension set into EMF documents.
+        
+        Metrics with more than EMF_MAX_VALUES values are spread across
+        consecutive documents.
+        
+        Args:
+            dimension_key: Caller-supplied dimension name/value pairs
+            metrics: (name, unit, values, timestamp) for each metric
+            
+        Yields:
+            One JSON document per line
+        """
+        members = {**dict(dimension_key), 'Environment': self.environment}
+        dimension_names = [list(members)]
+        timestamp = int(max(metric[3] for metric in metrics).timestamp() * 1000)
+        max_values = max(len(metric[2]) for metric in metrics)
+        
+        for offset in range(0, max_values, EMF_MAX_VALUES):
+            document: Dict[str, Any] = dict(members)
+            definitions = []
+            for name, unit, values, _ in metrics:
+                chunk = values[offset:offset + EMF_MAX_VALUES]
+                if not chunk:
+                    continue
+                definitions.append({'Name': name, 'Unit': unit})
+                document[name] = chunk[0] if len(chunk) == 1 else chunk
+            
+            document['_aws'] = {
+                'Timestamp': timestamp,
+                'CloudWatchMetrics': [{
+                    'Namespace': self.namespace,
+                    'Dimensions': dimension_names,
+                    'Metrics': definitions
+                }]
+            }
+            yield json.dumps(document, separators=(',', ':'))
+
+
+# Publisher shared by all invocations in this container
+_publisher: Optional[MetricsPublisher] = None
+_publisher_lock = threading.Lock()
 
 
 def get_metrics_publisher() -> MetricsPublisher:
     """
-    Get or create a metrics publisher.
+    Get or create the metrics publisher for this container.
+    
+    The publisher and its CloudWatch client are built on first use and
+    reused by later warm invocations. METRICS_MODE selects EMF log output
+    ('emf', the default) or PutMetricData calls ('api'). Handlers must call
+    flush() on it before returning, since Lambda freezes the background
+    worker between invocations.
     
     Returns:
-        MetricsPublisher instance
+        Shared MetricsPublisher instance
     """
-    return MetricsPublisher()
+    global _publisher
+    
+    if _publisher is None:
+        with _publisher_lock:
+            if _publisher is None:
+                if os.environ.get('METRICS_MODE', METRICS_MODE_EMF) == METRICS_MODE_API:
+                    _publisher = MetricsPublisher()
+                else:
+                    _publisher = EMFMetricsPublisher()
+    
+    return _publisher
@@ -1,14 +1,165 @@
 """Data models and schemas for Archon RAG system."""
 
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple, Union
+import array
+import base64
+import functools
 import json
 import hashlib
+import sys
 
+import numpy as np
 
-@dataclass
-class Document:
+# Try to import orjson, but make it optional
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+
+def _dumps(data: Dict[str, Any]) -> str:
+    """
+    Serialize a dictionary to a JSON string.
+    
+    Uses orjson when available, falling back to the standard library.
+    
+    Args:
+        data: Dictionary to serialize
+        
+    Returns:
+        JSON string
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(data)
+
+
+def _loads(json_str: str) -> Dict[str, Any]:
+    """
+    Parse a JSON string.
+    
+    Uses orjson when available, falling back to the standard library.
+    
+    Args:
+        json_str: JSON string
+        
+    Returns:
+        Parsed dictionary
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(json_str)
+    return json.loads(json_str)
+
+
+# datetime.fromisoformat accepts a trailing "Z" from Python 3.11
+_FROMISO = datetime.fromisoformat
+_FROMISO_PARSES_Z = sys.version_info >= (3, 11)
+
+
+def _parse_iso_datetime(value: str) -> datetime:
+    """
+    Parse an ISO 8601 timestamp, including a "Z" UTC suffix.
+    
+    Args:
+        value: ISO format timestamp string
+        
+    Returns:
+        Parsed datetime
+    """
+    if not _FROMISO_PARSES_Z and value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return _FROMISO(value)
+
+
+# Field checks: (attribute, allowed types, optional predicate on the value, error message)
+Schema = Tuple[Tuple[str, Union[type, Tuple[type, ...]], Optional[Callable[[Any], bool]], str], ...]
+
+
+def _non_negative(value: Any) -> bool:
+    """Check that a numeric value is non-negative."""
+    return value >= 0
+
+
+def _is_numeric_vector(vector: Union[List[Any], array.array, bytes]) -> bool:
+    """
+    Check that a list is a flat sequence of numbers.
+    
+    The list is converted in one NumPy call; strings, None, or nested
+    sequences produce a non-numeric dtype or extra dimensions. Quantized
+    byte buffers are numeric by construction, and float arrays must use
+    the 'f' typecode.
+    """
+    if isinstance(vector, bytes):
+        return True
+    if isinstance(vector, array.array):
+        return vector.typecode == 'f'
+    try:
+        values = np.asarray(vector)
+    except (TypeError, ValueError):
+        return False
+    return values.ndim == 1 and values.dtype.kind in 'biuf'
+
+
+def _is_finite_vector(vector: Union[List[Any], array.array, bytes]) -> bool:
+    """
+    Check that a numeric vector has no infinite or NaN values.
+    
+    Values outside the FP32 range become infinite when packed into an
+    array.array('f'), so this also catches inputs that overflowed.
+    """
+    if isinstance(vector, bytes):
+        return True
+    if isinstance(vector, array.array):
+        values = np.frombuffer(vector, dtype=np.float32)
+    else:
+        values = np.asarray(vector, dtype=np.float64)
+    return bool(np.isfinite(values).all())
+
+
+@functools.lru_cache(maxsize=1024)
+def _chunk_id_prefix(repo_url: str, file_path: str) -> bytes:
+    """
+    Encode the chunk ID prefix shared by every chunk of a document.
+    
+    Cached per (repo_url, file_path), so chunks of the same document encode
+    the prefix once and only encode their own index.
+    
+    Returns:
+        UTF-8 bytes of "repo_url#file_path#"
+    """
+    return f"{repo_url}#{file_path}#".encode()
+
+
+class _SchemaModel:
+    """
+    Base class for models validated against a class-level field schema.
+    
+    Subclasses declare _SCHEMA, which validate() checks in a single pass.
+    """
+    
+    __slots__ = ()
+    
+    _SCHEMA: ClassVar[Schema] = ()
+    
+    def _run_schema(self) -> None:
+        """
+        Check every field against the class schema.
+        
+        Raises:
+            ValueError: With the message of the first failing check
+        """
+        for name, types, predicate, message in self._SCHEMA:
+            value = getattr(self, name)
+            if not isinstance(value, types) or (predicate is not None and not predicate(value)):
+                raise ValueError(message)
+
+
+@dataclass(slots=True)
+class Document(_SchemaModel):
     """
     Represents a document from a repository.
     
@@ -29,6 +180,16 @@ class Document:
     document_type: str = "kiro_doc"
     source_type: str = "github"
     
+    _SCHEMA: ClassVar[Schema] = (
+        ('repo_url', str, bool, "repo_url must be a non-empty string"),
+        ('file_path', str, bool, "file_path must be a non-empty string"),
+        ('content', str, None, "content must be a string"),
+        ('sha', str, bool, "sha must be a non-empty string"),
+        ('last_modified', datetime, None, "last_modified must be a datetime object"),
+        ('document_type', str, bool, "document_type must be a non-empty string"),
+        ('source_type', str, bool, "source_type must be a non-empty string"),
+    )
+    
     def validate(self) -> bool:
         """
         Validate document fields.
@@ -39,26 +200,7 @@ class Document:
         Raises:
             ValueError: If validation fails
         """
-        if not self.repo_url or not isinstance(self.repo_url, str):
-            raise ValueError("repo_url must be a non-empty string")
-        
-        if not self.file_path or not isinstance(self.file_path, str):
-            raise ValueError("file_path must be a non-empty string")
-        
-        if not isinstance(self.content, str):
-            raise ValueError("content must be a string")
-        
-        if not self.sha or not isinstance(self.sha, str):
-            raise ValueError("sha must be a non-empty string")
-        
-        if not isinstance(self.last_modified, datetime):
-            raise ValueError("last_modified must be a datetime object")
-        
-        if not self.document_type or not isinstance(self.document_type, str):
-            raise ValueError("document_type must be a non-empty string")
-        
-        if not self.source_type or not isinstance(self.source_type, str):
-            raise ValueError("source_type must be a non-empty string")
+        self._run_schema()
         
         return True
     
@@ -69,10 +211,16 @@ class Document:
         Returns:
             Dictionary representation
         """
-        data = asdict(self)
-        # Convert datetime to ISO format string
-        data['last_modified'] = self.last_modified.isoformat()
-        return data
+        return {
+            'repo_url': self.repo_url,
+            'file_path': self.file_path,
+            'content': self.content,
+            'sha': self.sha,
+            # Convert datetime to ISO format string
+            'last_modified': self.last_modified.isoformat(),
+            'document_type': self.document_type,
+            'source_type': self.source_type
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Document':
@@ -86,10 +234,9 @@ class Document:
             Document instance
         """
         # Parse datetime from ISO format
-        if isinstance(data.get('last_modified'), str):
-            data['last_modified'] = datetime.fromisoformat(
-                data['last_modified'].replace('Z', '+00:00')
-            )
+        last_modified = data.get('last_modified')
+        if isinstance(last_modified, str):
+            data['last_modified'] = _parse_iso_datetime(last_modified)
         
         return cls(**data)
     
@@ -100,7 +247,7 @@ class Document:
         Returns:
             JSON string representation
         """
-        return json.dumps(self.to_dict())
+        return _dumps(self.to_dict())
     
     @classmethod
     def from_json(cls, json_str: str) -> 'Document':
@@ -113,12 +260,21 @@ class Document:
         Returns:
             Document instance
         """
-        data = json.loads(json_str)
-        return cls.from_dict(data)
+        # Build directly from the parsed fields; JSON always carries last_modified as a string
+        data = _loads(json_str)
+        return cls(
+            repo_url=data['repo_url'],
+            file_path=data['file_path'],
+            content=data['content'],
+            sha=data['sha'],
+            last_modified=_parse_iso_datetime(data['last_modified']),
+            document_type=data.get('document_type', "kiro_doc"),
+            source_type=data.get('source_type', "github")
+        )
 
 
-@dataclass
-class DocumentChunk:
+@dataclass(slots=True)
+class DocumentChunk(_SchemaModel):
     """
     Represents a chunk of a document.
     
@@ -135,6 +291,14 @@ class DocumentChunk:
     start_char: int
     end_char: int
     
+    _SCHEMA: ClassVar[Schema] = (
+        ('document', Document, None, "document must be a Document instance"),
+        ('chunk_index', int, _non_negative, "chunk_index must be a non-negative integer"),
+        ('text', str, None, "text must be a string"),
+        ('start_char', int, _non_negative, "start_char must be a non-negative integer"),
+        ('end_char', int, _non_negative, "end_char must be a non-negative integer"),
+    )
+    
     def validate(self) -> bool:
         """
         Validate document chunk fields.
@@ -145,24 +309,11 @@ class DocumentChunk:
         Raises:
             ValueError: If validation fails
         """
-        if not isinstance(self.document, Document):
-            raise ValueError("document must be a Document instance")
+        self._run_schema()
         
         # Validate document
         self.document.validate()
         
-        if not isinstance(self.chunk_index, int) or self.chunk_index < 0:
-            raise ValueError("chunk_index must be a non-negative integer")
-        
-        if not isinstance(self.text, str):
-            raise ValueError("text must be a string")
-        
-        if not isinstance(self.start_char, int) or self.start_char < 0:
-            raise ValueError("start_char must be a non-negative integer")
-        
-        if not isinstance(self.end_char, int) or self.end_char < 0:
-            raise ValueError("end_char must be a non-negative integer")
-        
         if self.end_char < self.start_char:
             raise ValueError("end_char must be >= start_char")
         
@@ -175,8 +326,10 @@ class DocumentChunk:
         Returns:
             SHA256 hash as hex string
         """
-        id_string = f"{self.document.repo_url}#{self.document.file_path}#{self.chunk_index}"
-        return hashlib.sha256(id_string.encode()).hexdigest()
+        # The document prefix is encoded once; only the chunk index is encoded per chunk
+        hasher = hashlib.sha256(_chunk_id_prefix(self.document.repo_url, self.document.file_path))
+        hasher.update(str(self.chunk_index).encode('ascii'))
+        return hasher.hexdigest()
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -214,8 +367,8 @@ class DocumentChunk:
         )
 
 
-@dataclass
-class RepositoryConfig:
+@dataclass(slots=True)
+class RepositoryConfig(_SchemaModel):
     """
     Configuration for a GitHub repository to monitor.
     
@@ -228,9 +381,18 @@ class RepositoryConfig:
     branch: str
     paths: List[str]
     
+    _SCHEMA: ClassVar[Schema] = (
+        ('url', str, bool, "url must be a non-empty string"),
+        ('branch', str, bool, "branch must be a non-empty string"),
+        ('paths', list, None, "paths must be a list"),
+        ('paths', list, bool, "paths must contain at least one path"),
+        ('paths', list, lambda paths: all(isinstance(path, str) for path in paths),
+         "all paths must be strings"),
+    )
+    
     def validate(self) -> bool:
         """
-        Validate repository configuration.
+        Validate repository configuration fields.
         
         Returns:
             True if valid
@@ -238,21 +400,7 @@ class RepositoryConfig:
         Raises:
             ValueError: If validation fails
         """
-        if not self.url or not isinstance(self.url, str):
-            raise ValueError("url must be a non-empty string")
-        
-        if not self.branch or not isinstance(self.branch, str):
-            raise ValueError("branch must be a non-empty string")
-        
-        if not isinstance(self.paths, list):
-            raise ValueError("paths must be a list")
-        
-        if not self.paths:
-            raise ValueError("paths must contain at least one path")
-        
-        for path in self.paths:
-            if not isinstance(path, str):
-                raise ValueError("all paths must be strings")
+        self._run_schema()
         
         return True
     
@@ -260,10 +408,17 @@ class RepositoryConfig:
         """
         Convert to dictionary for serialization.
         
+        The returned paths list is shared with this instance, not copied,
+        so callers must not mutate it.
+        
         Returns:
             Dictionary representation
         """
-        return asdict(self)
+        return {
+            'url': self.url,
+            'branch': self.branch,
+            'paths': self.paths
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'RepositoryConfig':
@@ -279,8 +434,8 @@ class RepositoryConfig:
         return cls(**data)
 
 
-@dataclass
-class SourceReference:
+@dataclass(slots=True)
+class SourceReference(_SchemaModel):
     """
     Reference to a source document.
     
@@ -295,6 +450,14 @@ class SourceReference:
     relevance_score: float
     chunk_text: Optional[str] = None
     
+    _SCHEMA: ClassVar[Schema] = (
+        ('repo', str, bool, "repo must be a non-empty string"),
+        ('file_path', str, bool, "file_path must be a non-empty string"),
+        ('relevance_score', (int, float), None, "relevance_score must be a number"),
+        ('relevance_score', (int, float), _non_negative, "relevance_score must be non-negative"),
+        ('chunk_text', (str, type(None)), None, "chunk_text must be a string or None"),
+    )
+    
     def validate(self) -> bool:
         """
         Validate source reference fields.
@@ -305,20 +468,7 @@ class SourceReference:
         Raises:
             ValueError: If validation fails
         """
-        if not self.repo or not isinstance(self.repo, str):
-            raise ValueError("repo must be a non-empty string")
-        
-        if not self.file_path or not isinstance(self.file_path, str):
-            raise ValueError("file_path must be a non-empty string")
-        
-        if not isinstance(self.relevance_score, (int, float)):
-            raise ValueError("relevance_score must be a number")
-        
-        if self.relevance_score < 0:
-            raise ValueError("relevance_score must be non-negative")
-        
-        if self.chunk_text is not None and not isinstance(self.chunk_text, str):
-            raise ValueError("chunk_text must be a string or None")
+        self._run_schema()
         
         return True
     
@@ -329,7 +479,12 @@ class SourceReference:
         Returns:
             Dictionary representation
         """
-        return asdict(self)
+        return {
+            'repo': self.repo,
+            'file_path': self.file_path,
+            'relevance_score': self.relevance_score,
+            'chunk_text': self.chunk_text
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'SourceReference':
@@ -345,8 +500,8 @@ class SourceReference:
         return cls(**data)
 
 
-@dataclass
-class QueryResponse:
+@dataclass(slots=True)
+class QueryResponse(_SchemaModel):
     """
     Response to a query request.
     
@@ -361,6 +516,15 @@ class QueryResponse:
     timestamp: str
     query: str
     
+    _SCHEMA: ClassVar[Schema] = (
+        ('answer', str, None, "answer must be a string"),
+        ('sources', list, None, "sources must be a list"),
+        ('sources', list, lambda sources: all(isinstance(source, SourceReference) for source in sources),
+         "all sources must be SourceReference instances"),
+        ('timestamp', str, bool, "timestamp must be a non-empty string"),
+        ('query', str, None, "query must be a string"),
+    )
+    
     def validate(self) -> bool:
         """
         Validate query response fields.
@@ -371,23 +535,11 @@ class QueryResponse:
         Raises:
             ValueError: If validation fails
         """
-        if not isinstance(self.answer, str):
-            raise ValueError("answer must be a string")
-        
-        if not isinstance(self.sources, list):
-            raise ValueError("sources must be a list")
+        self._run_schema()
         
         for source in self.sources:
-            if not isinstance(source, SourceReference):
-                raise ValueError("all sources must be SourceReference instances")
             source.validate()
         
-        if not self.timestamp or not isinstance(self.timestamp, str):
-            raise ValueError("timestamp must be a non-empty string")
-        
-        if not isinstance(self.query, str):
-            raise ValueError("query must be a string")
-        
         return True
     
     def to_dict(self) -> Dict[str, Any]:
@@ -430,7 +582,7 @@ class QueryResponse:
         Returns:
             JSON string representation
         """
-        return json.dumps(self.to_dict())
+        return _dumps(self.to_dict())
     
     @classmethod
     def from_json(cls, json_str: str) -> 'QueryResponse':
@@ -443,12 +595,26 @@ class QueryResponse:
         Returns:
             QueryResponse instance
         """
-        data = json.loads(json_str)
-        return cls.from_dict(data)
+        # Build sources inline rather than through SourceReference.from_dict
+        data = _loads(json_str)
+        return cls(
+            answer=data['answer'],
+            sources=[
+                SourceReference(
+                    repo=source['repo'],
+                    file_path=source['file_path'],
+                    relevance_score=source['relevance_score'],
+                    chunk_text=source.get('chunk_text')
+                )
+                for source in data['sources']
+            ],
+            timestamp=data['timestamp'],
+            query=data['query']
+        )
 
 
-@dataclass
-class MonitoringResult:
+@dataclass(slots=True)
+class MonitoringResult(_SchemaModel):
     """
     Results from a monitoring execution.
     
@@ -465,6 +631,16 @@ class MonitoringResult:
     errors: List[str]
     execution_time: float
     
+    _SCHEMA: ClassVar[Schema] = (
+        ('repositories_checked', int, _non_negative, "repositories_checked must be a non-negative integer"),
+        ('documents_processed', int, _non_negative, "documents_processed must be a non-negative integer"),
+        ('documents_updated', int, _non_negative, "documents_updated must be a non-negative integer"),
+        ('errors', list, None, "errors must be a list"),
+        ('errors', list, lambda errors: all(isinstance(error, str) for error in errors),
+         "all errors must be strings"),
+        ('execution_time', (int, float), _non_negative, "execution_time must be a non-negative number"),
+    )
+    
     def validate(self) -> bool:
         """
         Validate monitoring result fields.
@@ -475,24 +651,7 @@ class MonitoringResult:
         Raises:
             ValueError: If validation fails
         """
-        if not isinstance(self.repositories_checked, int) or self.repositories_checked < 0:
-            raise ValueError("repositories_checked must be a non-negative integer")
-        
-        if not isinstance(self.documents_processed, int) or self.documents_processed < 0:
-            raise ValueError("documents_processed must be a non-negative integer")
-        
-        if not isinstance(self.documents_updated, int) or self.documents_updated < 0:
-            raise ValueError("documents_updated must be a non-negative integer")
-        
-        if not isinstance(self.errors, list):
-            raise ValueError("errors must be a list")
-        
-        for error in self.errors:
-            if not isinstance(error, str):
-                raise ValueError("all errors must be strings")
-        
-        if not isinstance(self.execution_time, (int, float)) or self.execution_time < 0:
-            raise ValueError("execution_time must be a non-negative number")
+        self._run_schema()
         
         return True
     
@@ -500,10 +659,19 @@ class MonitoringResult:
         """
         Convert to dictionary for serialization.
         
+        The returned errors list is shared with this instance, not copied,
+        so callers must not mutate it.
+        
         Returns:
             Dictionary representation
         """
-        return asdict(self)
+        return {
+            'repositories_checked': self.repositories_checked,
+            'documents_processed': self.documents_processed,
+            'documents_updated': self.documents_updated,
+            'errors': self.errors,
+            'execution_time': self.execution_time
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'MonitoringResult':
@@ -525,7 +693,7 @@ class MonitoringResult:
         Returns:
             JSON string representation
         """
-        return json.dumps(self.to_dict())
+        return _dumps(self.to_dict())
     
     @classmethod
     def from_json(cls, json_str: str) -> 'MonitoringResult':
@@ -538,71 +706,189 @@ class MonitoringResult:
         Returns:
             MonitoringResult instance
         """
-        data = json.loads(json_str)
+        data = _loads(json_str)
         return cls.from_dict(data)
 
 
-@dataclass
-class VectorDocument:
+@dataclass(slots=True)
+class VectorDocument(_SchemaModel):
     """
     Represents a document with embeddings for vector storage.
     
+    FP32 vectors are stored as a contiguous array.array('f'), 4 bytes per
+    element instead of a boxed float each; lists passed in are converted on
+    construction. Quantized vectors (fp16 or int8) are stored as raw bytes,
+    and int8 vectors keep their scale factor in metadata['scale'].
+    
     Attributes:
         id: Unique identifier for the document
-        vector: Embedding vector
+        vector: Embedding vector, or quantized vector bytes
         metadata: Document metadata
         text: Document text content
+        dtype: Vector encoding: fp32, fp16, or int8 (default: "fp32")
     """
     id: str
-    vector: List[float]
+    vector: Union[List[float], array.array, bytes]
     metadata: Dict[str, Any]
     text: str
+    dtype: str = "fp32"
+    
+    # NumPy storage type for each vector encoding
+    _DTYPES: ClassVar[Dict[str, Any]] = {
+        'fp32': np.float32,
+        'fp16': np.float16,
+        'int8': np.int8
+    }
+    
+    _SCHEMA: ClassVar[Schema] = (
+        ('id', str, bool, "id must be a non-empty string"),
+        ('vector', (list, array.array, bytes), None, "vector must be a list"),
+        ('vector', (list, array.array, bytes), bool, "vector must not be empty"),
+        ('vector', (list, array.array, bytes), _is_numeric_vector,
+         "all vector values must be numbers"),
+        ('vector', (list, array.array, bytes), _is_finite_vector,
+         "all vector values must be finite"),
+        ('metadata', dict, None, "metadata must be a dictionary"),
+        ('text', str, None, "text must be a string"),
+        ('dtype', str, lambda dtype: dtype in VectorDocument._DTYPES,
+         "dtype must be one of fp32, fp16, int8"),
+    )
+    
+    # Metadata fields every vector document must carry
+    _REQUIRED_METADATA: ClassVar[Tuple[str, ...]] = ('repo_url', 'file_path')
+    
+    def __post_init__(self) -> None:
+        """Convert FP32 list vectors to a packed float array."""
+        if self.dtype == 'fp32' and isinstance(self.vector, list):
+            try:
+                self.vector = array.array('f', self.vector)
+            except (TypeError, OverflowError):
+                # Left as a list so validate() reports the bad values
+                pass
     
     def validate(self) -> bool:
         """
         Validate vector document fields.
         
+        This runs for every embedding on the ingest path, so it is skipped
+        under python -O; the other models always validate.
+        
         Returns:
             True if valid
             
         Raises:
             ValueError: If validation fails
         """
-        if not self.id or not isinstance(self.id, str):
-            raise ValueError("id must be a non-empty string")
+        if __debug__:
+            self._run_schema()
+            
+            # Validate required metadata fields
+            for field_name in self._REQUIRED_METADATA:
+                if field_name not in self.metadata:
+                    raise ValueError(f"metadata must contain '{field_name}' field")
+            
+            if self.dtype != 'fp32' and not isinstance(self.vector, bytes):
+                raise ValueError("quantized vectors must be stored as bytes")
+            
+            if self.dtype == 'int8' and 'scale' not in self.metadata:
+                raise ValueError("int8 vectors must have a 'scale' metadata field")
+        
+        return True
+    
+    @classmethod
+    def from_embedding(
+        cls,
+        id: str,
+        embedding: List[float],
+        metadata: Dict[str, Any],
+        text: str,
+        quantize: str = "fp32"
+    ) -> 'VectorDocument':
+        """
+        Create VectorDocument from an embedding, optionally quantizing it.
         
-        if not isinstance(self.vector, list):
-            raise ValueError("vector must be a list")
+        int8 quantization uses a per-vector scale of max(abs(embedding)) / 127,
+        stored in metadata['scale'].
         
-        if not self.vector:
-            raise ValueError("vector must not be empty")
+        Args:
+            id: Unique identifier for the document
+            embedding: Embedding vector
+            metadata: Document metadata
+            text: Document text content
+            quantize: Vector encoding: fp32, fp16, or int8
+            
+        Returns:
+            VectorDocument instance
+            
+        Raises:
+            ValueError: If quantize is not a supported encoding
+        """
+        if quantize == 'fp32':
+            return cls(id=id, vector=array.array('f', embedding), metadata=metadata, text=text)
         
-        for val in self.vector:
-            if not isinstance(val, (int, float)):
-                raise ValueError("all vector values must be numbers")
+        if quantize == 'fp16':
+            vector = np.asarray(embedding, dtype=np.float16).tobytes()
+        elif quantize == 'int8':
+            values = np.asarray(embedding, dtype=np.float32)
+            scale = float(np.max(np.abs(values))) / 127 if values.size else 0.0
+            scale = scale or 1.0
+            vector = np.round(values / scale).astype(np.int8).tobytes()
+            metadata = {**metadata, 'scale': scale}
+        else:
+            raise ValueError("quantize must be one of fp32, fp16, int8")
         
-        if not isinstance(self.metadata, dict):
-            raise ValueError("metadata must be a dictionary")
+        return cls(id=id, vector=vector, metadata=metadata, text=text, dtype=quantize)
+    
+    def as_fp32(self) -> np.ndarray:
+        """
+        Get the embedding as an FP32 NumPy array, dequantizing if needed.
         
-        # Validate required metadata fields
-        required_fields = ['repo_url', 'file_path']
-        for field in required_fields:
-            if field not in self.metadata:
-                raise ValueError(f"metadata must contain '{field}' field")
+        FP32 arrays are returned as a zero-copy view of the vector buffer.
         
-        if not isinstance(self.text, str):
-            raise ValueError("text must be a string")
+        Returns:
+            One-dimensional float32 array
+        """
+        if isinstance(self.vector, array.array):
+            return np.frombuffer(self.vector, dtype=np.float32)
+        if not isinstance(self.vector, bytes):
+            return np.asarray(self.vector, dtype=np.float32)
         
-        return True
+        values = np.frombuffer(self.vector, dtype=self._DTYPES[self.dtype]).astype(np.float32)
+        if self.dtype == 'int8':
+            values *= np.float32(self.metadata['scale'])
+        return values
     
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert to dictionary for serialization.
         
+        FP32 vectors are expanded to a list of floats widened exactly from
+        the stored values, so they round-trip without loss. Quantized vectors
+        are base64-encoded and add a 'dtype' key; FP32 dictionaries keep the
+        original keys. The returned metadata is shared with this instance,
+        not copied, so callers must not mutate it.
+        
         Returns:
             Dictionary representation
         """
-        return asdict(self)
+        vector = self.vector
+        if isinstance(vector, array.array):
+            vector = np.frombuffer(vector, dtype=np.float32).tolist()
+        elif isinstance(vector, bytes):
+            vector = base64.b64encode(vector).decode('ascii')
+        
+        data = {
+            'id': self.id,
+            'vector': vector,
+            'metadata': self.metadata,
+            'text': self.text
+        }
+        
+        # The default fp32 form keeps the original dictionary shape
+        if self.dtype != 'fp32':
+            data['dtype'] = self.dtype
+        
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'VectorDocument':
@@ -615,4 +901,7 @@ class VectorDocument:
         Returns:
             VectorDocument instance
         """
+        if isinstance(data.get('vector'), str):
+            data = {**data, 'vector': base64.b64decode(data['vector'])}
+        
         return cls(**data)
@@ -2,17 +2,82 @@
 
 from functools import wraps
 from typing import Any, Callable, Dict, Optional
+import logging
+import math
 import os
+import threading
 
 # Try to import X-Ray SDK, but make it optional
 try:
     from aws_xray_sdk.core import xray_recorder
     from aws_xray_sdk.core import patch_all
+    from aws_xray_sdk.core.utils import stacktrace
     XRAY_AVAILABLE = True
 except ImportError:
     XRAY_AVAILABLE = False
     xray_recorder = None
 
+logger = logging.getLogger(__name__)
+
+# Tracing is switched on or off once at import; when off, the helpers below are bound to no-ops
+_ENABLED = XRAY_AVAILABLE and os.environ.get('XRAY_ENABLED', 'true').lower() == 'true'
+
+if _ENABLED:
+    # Recorder methods bound once so the traced paths skip the attribute lookups
+    _current_subsegment = xray_recorder.current_subsegment
+    _begin_subsegment = xray_recorder.begin_subsegment
+    _end_subsegment = xray_recorder.end_subsegment
+
+
+def _read_sample_rate() -> float:
+    """
+    Read XRAY_SAMPLE_RATE, clamped to [0, 1].
+    
+    A malformed value falls back to sampling everything rather than
+    failing the import of every module that traces.
+    
+    Returns:
+        Fraction of traced operations to record
+    """
+    raw = os.environ.get('XRAY_SAMPLE_RATE', '1.0')
+    try:
+        rate = float(raw)
+        if math.isnan(rate):
+            raise ValueError(raw)
+    except ValueError:
+        logger.warning(f"Invalid XRAY_SAMPLE_RATE {raw!r}, sampling all operations")
+        return 1.0
+    
+    return min(max(rate, 0.0), 1.0)
+
+
+# Fraction of TracedOperation blocks that get a subsegment, read once at import
+_SAMPLE_RATE = _read_sample_rate()
+_sample_state = threading.local()
+
+
+def _should_sample() -> bool:
+    """
+    Decide whether the next traced operation on this thread is recorded.
+    
+    Each call adds _SAMPLE_RATE to a per-thread credit and samples whenever
+    the credit reaches 1, so that fraction of operations is kept and the
+    samples are evenly spaced rather than random.
+    
+    Returns:
+        True if a subsegment should be created
+    """
+    if _SAMPLE_RATE >= 1.0:
+        return True
+    
+    credit = getattr(_sample_state, 'credit', 0.0) + _SAMPLE_RATE
+    if credit >= 1.0:
+        _sample_state.credit = credit - 1.0
+        return True
+    
+    _sample_state.credit = credit
+    return False
+
 
 def initialize_xray() -> None:
     """
@@ -39,7 +104,7 @@ def initialize_xray() -> None:
         print(f"Failed to initialize X-Ray: {str(e)}")
 
 
-def trace_function(name: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None):
+def _trace_function_real(name: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None):
     """
     Decorator to trace a function with X-Ray.
     
@@ -51,45 +116,51 @@ def trace_function(name: Optional[str] = None, metadata: Optional[Dict[str, Any]
         Decorated function
     """
     def decorator(func: Callable) -> Callable:
+        subsegment_name = name or func.__name__
+        
+        # Caller metadata plus function info, fixed at decoration time
+        metadata_items = (
+            *(metadata.items() if metadata else ()),
+            ('function', func.__name__),
+            ('module', func.__module__)
+        )
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
-            if not XRAY_AVAILABLE or not xray_recorder:
-                # X-Ray not available, just execute function
+            subsegment = _begin_subsegment(subsegment_name)
+            if subsegment is None:
+                # No active segment, so run untraced
                 return func(*args, **kwargs)
             
-            subsegment_name = name or func.__name__
-            
             try:
-                # Create subsegment
-                with xray_recorder.capture(subsegment_name) as subsegment:
-                    # Add metadata
-                    if metadata:
-                        for key, value in metadata.items():
-                            subsegment.put_metadata(key, value)
-                    
-                    # Add function info
-                    subsegment.put_metadata('function', func.__name__)
-                    subsegment.put_metadata('module', func.__module__)
-                    
-                    # Execute function
-                    result = func(*args, **kwargs)
-                    
-                    return result
-                    
+                for key, value in metadata_items:
+                    subsegment.put_metadata(key, value)
+                
+                return func(*args, **kwargs)
+                
             except Exception as e:
                 # Record exception in X-Ray
-                if xray_recorder:
-                    try:
-                        xray_recorder.current_subsegment().add_exception(e)
-                    except:
-                        pass
+                subsegment.add_exception(e, stacktrace.get_stacktrace(limit=xray_recorder.max_trace_back))
                 raise
+                
+            finally:
+                _end_subsegment()
         
         return wrapper
     return decorator
 
 
-def add_annotation(key: str, value: Any) -> None:
+def _trace_function_noop(name: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None):
+    """Return an identity decorator when tracing is disabled."""
+    return _identity
+
+
+def _identity(func: Callable) -> Callable:
+    """Return the function unchanged."""
+    return func
+
+
+def _add_annotation_real(key: str, value: Any) -> None:
     """
     Add an annotation to the current X-Ray segment.
     
@@ -99,19 +170,13 @@ def add_annotation(key: str, value: Any) -> None:
         key: Annotation key
         value: Annotation value (must be string, number, or boolean)
     """
-    if not XRAY_AVAILABLE or not xray_recorder:
-        return
-    
-    try:
-        subsegment = xray_recorder.current_subsegment()
-        if subsegment:
-            subsegment.put_annotation(key, value)
-    except Exception:
-        # Silently fail if no active segment
-        pass
+    # current_subsegment() returns None when no segment is active
+    subsegment = _current_subsegment()
+    if subsegment is not None:
+        subsegment.put_annotation(key, value)
 
 
-def add_metadata(key: str, value: Any, namespace: str = 'default') -> None:
+def _add_metadata_real(key: str, value: Any, namespace: str = 'default') -> None:
     """
     Add metadata to the current X-Ray segment.
     
@@ -122,19 +187,17 @@ def add_metadata(key: str, value: Any, namespace: str = 'default') -> None:
         value: Metadata value
         namespace: Metadata namespace
     """
-    if not XRAY_AVAILABLE or not xray_recorder:
-        return
-    
-    try:
-        subsegment = xray_recorder.current_subsegment()
-        if subsegment:
-            subsegment.put_metadata(key, value, namespace)
-    except Exception:
-        # Silently fail if no active segment
-        pass
+    # current_subsegment() returns None when no segment is active
+    subsegment = _current_subsegment()
+    if subsegment is not None:
+        subsegment.put_metadata(key, value, namespace)
 
 
-class TracedOperation:
+def _noop(*args, **kwargs) -> None:
+    """Accept any arguments and do nothing."""
+
+
+class _TracedOperationReal:
     """
     Context manager for tracing operations with X-Ray.
     
@@ -144,6 +207,8 @@ class TracedOperation:
             # do work
     """
     
+    __slots__ = ('name', 'subsegment')
+    
     def __init__(self, name: str):
         """
         Initialize traced operation.
@@ -155,64 +220,76 @@ class TracedOperation:
         self.subsegment = None
     
     def __enter__(self):
-        """Start tracing."""
-        if XRAY_AVAILABLE and xray_recorder:
-            try:
-                self.subsegment = xray_recorder.begin_subsegment(self.name)
-            except Exception:
-                pass
+        """Start tracing, unless the operation is sampled out."""
+        if not _should_sample():
+            return self
+        
+        try:
+            self.subsegment = _begin_subsegment(self.name)
+        except Exception:
+            pass
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """End tracing."""
-        if self.subsegment and XRAY_AVAILABLE and xray_recorder:
-            try:
-                if exc_type is not None:
-                    # Record exception
-                    self.subsegment.add_exception(exc_val)
-                xray_recorder.end_subsegment()
-            except Exception:
-                pass
+        if self.subsegment is not None:
+            if exc_type is not None:
+                # Record exception
+                self.subsegment.add_exception(exc_val, stacktrace.get_stacktrace(limit=xray_recorder.max_trace_back))
+            _end_subsegment()
         return False
     
     def add_annotation(self, key: str, value: Any) -> None:
         """Add annotation to this operation."""
-        if self.subsegment:
-            try:
-                self.subsegment.put_annotation(key, value)
-            except Exception:
-                pass
+        if self.subsegment is not None:
+            self.subsegment.put_annotation(key, value)
     
     def add_metadata(self, key: str, value: Any, namespace: str = 'default') -> None:
         """Add metadata to this operation."""
-        if self.subsegment:
-            try:
-                self.subsegment.put_metadata(key, value, namespace)
-            except Exception:
-                pass
+        if self.subsegment is not None:
+            self.subsegment.put_metadata(key, value, namespace)
 
 
-# Convenience functions for common operations
+class _TracedOperationNoop:
+    """Stateless stand-in for TracedOperation when tracing is disabled."""
+    
+    __slots__ = ()
+    
+    def __init__(self, name: str):
+        pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+    
+    add_annotation = _noop
+    add_metadata = _noop
 
-@trace_function(name='github_api_call')
-def trace_github_call(func: Callable) -> Callable:
-    """Decorator for tracing GitHub API calls."""
-    return func
 
+if _ENABLED:
+    trace_function = _trace_function_real
+    add_annotation = _add_annotation_real
+    add_metadata = _add_metadata_real
+    TracedOperation = _TracedOperationReal
+else:
+    trace_function = _trace_function_noop
+    add_annotation = _noop
+    add_metadata = _noop
+    TracedOperation = _TracedOperationNoop
 
-@trace_function(name='bedrock_invocation')
-def trace_bedrock_call(func: Callable) -> Callable:
-    """Decorator for tracing Bedrock API calls."""
-    return func
 
+# Convenience decorators for common operations
 
-@trace_function(name='opensearch_operation')
-def trace_opensearch_call(func: Callable) -> Callable:
-    """Decorator for tracing OpenSearch operations."""
-    return func
+# Decorator for tracing GitHub API calls
+trace_github_call = trace_function(name='github_api_call')
 
+# Decorator for tracing Bedrock API calls
+trace_bedrock_call = trace_function(name='bedrock_invocation')
 
-@trace_function(name='dynamodb_operation')
-def trace_dynamodb_call(func: Callable) -> Callable:
-    """Decorator for tracing DynamoDB operations."""
-    return func
+# Decorator for tracing OpenSearch operations
+trace_opensearch_call = trace_function(name='opensearch_operation')
+
+# Decorator for tracing DynamoDB operations
+trace_dynamodb_call = trace_function(name='dynamodb_operation')
@@ -1,13 +1,16 @@
 """Vector store manager for OpenSearch Serverless integration."""
 
+import asyncio
 import uuid
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, List, Optional, Dict, Any
 from dataclasses import dataclass
 
 from opensearchpy import OpenSearch, RequestsHttpConnection
-from langchain_community.vectorstores import OpenSearchVectorSearch
 from langchain_aws import BedrockEmbeddings
 
+if TYPE_CHECKING:
+    from langchain_community.vectorstores import OpenSearchVectorSearch
+
 
 @dataclass
 class VectorDocument:
@@ -35,6 +38,9 @@ class VectorStoreManager:
     - Integration with LangChain OpenSearch vector store
     """
     
+    # Keep-alive connections per host; opensearch-py defaults to one
+    DEFAULT_POOL_MAXSIZE = 20
+    
     def __init__(
         self,
         opensearch_endpoint: str,
@@ -42,7 +48,8 @@ class VectorStoreManager:
         embedding_model: str = "amazon.titan-embed-text-v1",
         dimensions: int = 1536,
         opensearch_client: Optional[OpenSearch] = None,
-        embeddings: Optional[BedrockEmbeddings] = None
+        embeddings: Optional[BedrockEmbeddings] = None,
+        client_kwargs: Optional[Dict[str, Any]] = None
     ):
         """
         Initialize the vector store manager.
@@ -54,11 +61,13 @@ class VectorStoreManager:
             dimensions: Dimension size for vectors (default 1536 for Titan)
             opensearch_client: Optional pre-configured OpenSearch client (for testing)
             embeddings: Optional pre-configured embeddings object (for testing)
+            client_kwargs: Optional extra OpenSearch client options (e.g. pool_maxsize)
         """
         self.opensearch_endpoint = opensearch_endpoint
         self.index_name = index_name
         self.embedding_model = embedding_model
         self.dimensions = dimensions
+        self.client_kwargs = {'pool_maxsize': self.DEFAULT_POOL_MAXSIZE, **(client_kwargs or {})}
         
         # Initialize OpenSearch client
         if opensearch_client is not None:
@@ -73,7 +82,7 @@ class VectorStoreManager:
             self.embeddings = BedrockEmbeddings(model_id=embedding_model)
         
         # Initialize LangChain vector store (lazy initialization)
-        self._langchain_store: Optional[OpenSearchVectorSearch] = None
+        self._langchain_store: Optional["OpenSearchVectorSearch"] = None
     
     def _create_opensearch_client(self) -> OpenSearch:
         """
@@ -88,7 +97,7 @@ class VectorStoreManager:
             use_ssl=True,
             verify_certs=True,
             connection_class=RequestsHttpConnection,
-            pool_maxsize=20
+            **self.client_kwargs
         )
     
     def create_index(self, dimensions: Optional[int] = None) -> None:
@@ -200,6 +209,73 @@ class VectorStoreManager:
         except Exception as e:
             raise VectorStoreError(f"Failed to upsert vectors: {str(e)}") from e
     
+    def _build_knn_query(
+        self,
+        query_vector: List[float],
+        k: int,
+        filter_dict: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Build a k-nearest neighbors search body.
+        
+        Args:
+            query_vector: Query embedding vector
+            k: Number of results to return
+            filter_dict: Optional metadata filters
+            
+        Returns:
+            OpenSearch query body
+        """
+        knn_query = {
+            "size": k,
+            "query": {
+                "knn": {
+                    "vector": {
+                        "vector": query_vector,
+                        "k": k
+                    }
+                }
+            }
+        }
+        
+        # Add filters if provided
+        if filter_dict:
+            knn_query["query"] = {
+                "bool": {
+                    "must": [
+                        {"knn": {"vector": {"vector": query_vector, "k": k}}}
+                    ],
+                    "filter": [
+                        {"term": {f"metadata.{key}": value}}
+                        for key, value in filter_dict.items()
+                    ]
+                }
+            }
+        
+        return knn_query
+    
+    @staticmethod
+    def _parse_hits(response: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Convert OpenSearch search hits into result dictionaries.
+        
+        Args:
+            response: OpenSearch search response
+            
+        Returns:
+            List of documents with metadata and scores, in response order
+        """
+        results = []
+        for hit in response['hits']['hits']:
+            results.append({
+                'id': hit['_id'],
+                'score': hit['_score'],
+                'text': hit['_source'].get('text', ''),
+                'metadata': hit['_source'].get('metadata', {}),
+                'vector': hit['_source'].get('vector', [])
+            })
+        return results
+    
     def similarity_search(
         self,
         query_vector: List[float],
@@ -221,55 +297,91 @@ class VectorStoreManager:
             VectorStoreError: If search operation fails
         """
         try:
-            # Build query
-            knn_query = {
-                "size": k,
-                "query": {
-                    "knn": {
-                        "vector": {
-                            "vector": query_vector,
-                            "k": k
-                        }
-                    }
-                }
-            }
-            
-            # Add filters if provided
-            if filter_dict:
-                knn_query["query"] = {
-                    "bool": {
-                        "must": [
-                            {"knn": {"vector": {"vector": query_vector, "k": k}}}
-                        ],
-                        "filter": [
-                            {"term": {f"metadata.{key}": value}}
-                            for key, value in filter_dict.items()
-                        ]
-                    }
-                }
-            
             # Execute search
             response = self.client.search(
                 index=self.index_name,
-                body=knn_query
+                body=self._build_knn_query(query_vector, k, filter_dict)
             )
             
-            # Parse results
+            # Results are already ordered by score (descending) from OpenSearch
+            return self._parse_hits(response)
+            
+        except Exception as e:
+            raise VectorStoreError(f"Failed to perform similarity search: {str(e)}") from e
+    
+    async def asimilarity_search(
+        self,
+        query_vector: List[float],
+        k: int = 5,
+        filter_dict: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Asynchronously perform k-nearest neighbors similarity search.
+        
+        The search runs on a worker thread using the pooled client, so
+        concurrent searches from one event loop proceed in parallel.
+        
+        Args:
+            query_vector: Query embedding vector
+            k: Number of results to return
+            filter_dict: Optional metadata filters
+            
+        Returns:
+            List of documents with metadata and scores, ordered by relevance (descending)
+            
+        Raises:
+            VectorStoreError: If search operation fails
+        """
+        return await asyncio.to_thread(self.similarity_search, query_vector, k, filter_dict)
+    
+    def similarity_search_batch(
+        self,
+        query_vectors: List[List[float]],
+        k: int = 5,
+        filter_dict: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Perform several k-nearest neighbors searches in one request.
+        
+        Uses the multi-search API so all searches share a single HTTP
+        roundtrip.
+        
+        Args:
+            query_vectors: Query embedding vectors
+            k: Number of results to return per query
+            filter_dict: Optional metadata filters applied to every query
+            
+        Returns:
+            One result list per query vector, in the same order, each ordered
+            by relevance (descending)
+            
+        Raises:
+            VectorStoreError: If any search fails
+        """
+        if not query_vectors:
+            return []
+        
+        try:
+            # Multi-search body alternates header and query lines
+            msearch_body = []
+            for query_vector in query_vectors:
+                msearch_body.append({"index": self.index_name})
+                msearch_body.append(self._build_knn_query(query_vector, k, filter_dict))
+            
+            response = self.client.msearch(body=msearch_body)
+            
             results = []
-            for hit in response['hits']['hits']:
-                results.append({
-                    'id': hit['_id'],
-                    'score': hit['_score'],
-                    'text': hit['_source'].get('text', ''),
-                    'metadata': hit['_source'].get('metadata', {}),
-                    'vector': hit['_source'].get('vector', [])
-                })
+            for item in response['responses']:
+                if 'error' in item:
+                    raise VectorStoreError(f"Search in batch failed: {item['error']}")
+                results.append(self._parse_hits(item))
             
-            # Results are already ordered by score (descending) from OpenSearch
             return results
             
+        except VectorStoreError:
+            raise
         except Exception as e:
-            raise VectorStoreError(f"Failed to perform similarity search: {str(e)}") from e
+            raise VectorStoreError(f"Failed to perform batch similarity search: {str(e)}") from e
     
     def delete_by_source(self, repo: str, file_path: str) -> int:
         """
@@ -310,14 +422,19 @@ class VectorStoreManager:
         except Exception as e:
             raise VectorStoreError(f"Failed to delete by source: {str(e)}") from e
     
-    def get_langchain_store(self) -> OpenSearchVectorSearch:
+    def get_langchain_store(self) -> "OpenSearchVectorSearch":
         """
         Get LangChain OpenSearch vector store instance.
         
+        langchain_community is imported on first use, since the query and
+        ingestion paths talk to OpenSearch directly.
+        
         Returns:
             Configured OpenSearchVectorSearch instance
         """
         if self._langchain_store is None:
+            from langchain_community.vectorstores import OpenSearchVectorSearch
+            
             self._langchain_store = OpenSearchVectorSearch(
                 opensearch_url=f"https://{self.opensearch_endpoint}",
                 index_name=self.index_name,
@@ -325,7 +442,8 @@ class VectorStoreManager:
                 http_auth=None,  # Uses AWS SigV4
                 use_ssl=True,
                 verify_certs=True,
-                connection_class=RequestsHttpConnection
+                connection_class=RequestsHttpConnection,
+                **self.client_kwargs
             )
         
         return self._langchain_store
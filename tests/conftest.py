@@ -3,7 +3,27 @@
 import sys
 import os
 
+from hypothesis import HealthCheck, settings
+
 # Add lambda directory to Python path for all tests
 lambda_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'lambda'))
 if lambda_dir not in sys.path:
     sys.path.insert(0, lambda_dir)
+
+# Shared Hypothesis profile: 100 reproducible examples per property, without
+# per-example deadline timing. Set HYPOTHESIS_PROFILE=default for randomized runs.
+# Each pytest-xdist worker imports this module and loads the same profile.
+settings.register_profile(
+    'fast',
+    max_examples=100,
+    deadline=None,
+    derandomize=True,
+    suppress_health_check=[HealthCheck.too_slow, HealthCheck.function_scoped_fixture]
+)
+
+# Smoke profile for quick CI checks that every strategy still generates and every
+# property still runs. ARCHON_FAST_TESTS=1 makes it the default profile.
+settings.register_profile('smoke', parent=settings.get_profile('fast'), max_examples=5)
+
+_default_profile = 'smoke' if os.environ.get('ARCHON_FAST_TESTS') == '1' else 'fast'
+settings.load_profile(os.environ.get('HYPOTHESIS_PROFILE', _default_profile))
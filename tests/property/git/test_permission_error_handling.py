@@ -7,7 +7,7 @@ Validates: Requirements 9.2
 
 import os
 import sys
-from hypothesis import given, strategies as st, settings
+from hypothesis import given, strategies as st
 from unittest.mock import Mock, patch
 from datetime import datetime, timezone
 
@@ -92,7 +92,6 @@ def config_with_error_repositories(draw):
 
 # Feature: archon-rag-system, Property 20: Permission error handling
 @given(config_with_error_repositories())
-@settings(max_examples=100)
 def test_permission_error_handling(config_and_data):
     """
     For any repository access failure due to permissions, the system should 
@@ -167,7 +166,6 @@ def test_permission_error_handling(config_and_data):
 
 
 @given(st.lists(valid_github_url(), min_size=3, max_size=10))
-@settings(max_examples=100)
 def test_permission_error_does_not_stop_processing(repo_urls):
     """
     For any list of repositories where some have permission errors, processing 
@@ -240,7 +238,6 @@ def test_permission_error_does_not_stop_processing(repo_urls):
 
 
 @given(valid_github_url())
-@settings(max_examples=100)
 def test_permission_error_logged_and_skipped(repo_url):
     """
     For any repository with permission error, the error should be logged and 
@@ -318,7 +315,6 @@ def test_permission_error_logged_and_skipped(repo_url):
 
 
 @given(config_with_error_repositories())
-@settings(max_examples=100)
 def test_multiple_permission_errors_all_logged(config_and_data):
     """
     For any set of repositories with multiple permission errors, all errors 
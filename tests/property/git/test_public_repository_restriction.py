@@ -7,7 +7,7 @@ Validates: Requirements 9.1
 
 import os
 import sys
-from hypothesis import given, strategies as st, settings
+from hypothesis import given, strategies as st
 from unittest.mock import Mock, patch
 from datetime import datetime, timezone
 
@@ -82,7 +82,6 @@ def config_with_mixed_repositories(draw):
 
 # Feature: archon-rag-system, Property 19: Public repository restriction
 @given(config_with_mixed_repositories())
-@settings(max_examples=100)
 def test_public_repository_restriction(config_and_data):
     """
     For any repository URL in the configuration, the system should only 
@@ -153,7 +152,6 @@ def test_public_repository_restriction(config_and_data):
 
 
 @given(st.lists(valid_github_url(), min_size=1, max_size=10))
-@settings(max_examples=100)
 def test_only_public_repositories_accessed(repo_urls):
     """
     For any list of repository URLs, only those that are publicly accessible 
@@ -235,7 +233,6 @@ def test_only_public_repositories_accessed(repo_urls):
 
 
 @given(valid_github_url())
-@settings(max_examples=100)
 def test_private_repository_not_processed(repo_url):
     """
     For any private repository, the system should not process its contents.
@@ -7,7 +7,7 @@ Validates: Requirements 3.3
 
 import os
 import sys
-from hypothesis import given, strategies as st, settings
+from hypothesis import given, strategies as st
 from unittest.mock import Mock, patch
 from datetime import datetime, timezone
 
@@ -69,7 +69,6 @@ def document_content(draw):
     file_metadata_list(),
     st.lists(document_content(), min_size=1, max_size=10)
 )
-@settings(max_examples=100)
 def test_document_content_extraction(repo_url, file_metadata, contents):
     """
     For any detected document change, the system should successfully extract 
@@ -151,7 +150,6 @@ def test_document_content_extraction(repo_url, file_metadata, contents):
 
 
 @given(valid_github_url(), file_metadata_list())
-@settings(max_examples=100)
 def test_content_extraction_completeness(repo_url, file_metadata):
     """
     For any list of files, content extraction should attempt all files even 
@@ -210,7 +208,6 @@ def test_content_extraction_completeness(repo_url, file_metadata):
 
 
 @given(valid_github_url(), st.text(min_size=100, max_size=10000))
-@settings(max_examples=100)
 def test_content_extraction_preserves_full_text(repo_url, content):
     """
     For any document content, extraction should preserve the complete text 
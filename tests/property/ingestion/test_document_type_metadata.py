@@ -8,7 +8,7 @@ Validates: Requirements 10.3
 import os
 import sys
 from unittest.mock import Mock
-from hypothesis import given, strategies as st, settings
+from hypothesis import given, strategies as st
 from datetime import datetime, timezone
 
 
@@ -35,7 +35,6 @@ def document_with_type(draw):
 
 # Feature: archon-rag-system, Property 23: Document type metadata presence
 @given(document_with_type())
-@settings(max_examples=100)
 def test_document_type_metadata_presence(doc):
     """
     For any document stored in the knowledge base, the metadata should include 
@@ -78,7 +77,6 @@ def test_document_type_metadata_presence(doc):
 
 
 @given(st.lists(document_with_type(), min_size=1, max_size=5))
-@settings(max_examples=100)
 def test_document_type_metadata_across_multiple_documents(docs):
     """
     For any list of documents with different types, all vector documents 
@@ -121,7 +119,6 @@ def test_document_type_metadata_across_multiple_documents(docs):
 
 
 @given(document_with_type())
-@settings(max_examples=100)
 def test_document_type_fields_are_strings(doc):
     """
     For any document, the document_type and source_type fields should be 
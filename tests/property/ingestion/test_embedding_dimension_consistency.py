@@ -8,7 +8,7 @@ Validates: Requirements 4.1
 import os
 import sys
 from unittest.mock import Mock, MagicMock
-from hypothesis import given, strategies as st, settings
+from hypothesis import given, strategies as st
 
 
 from ingestion.ingestion_pipeline import IngestionPipeline, Document
@@ -30,7 +30,6 @@ def document_text(draw):
 
 # Feature: archon-rag-system, Property 9: Embedding dimension consistency
 @given(document_text())
-@settings(max_examples=100)
 def test_embedding_dimension_consistency(text):
     """
     For any document text, generated embeddings should have the configured 
@@ -64,7 +63,6 @@ def test_embedding_dimension_consistency(text):
 
 
 @given(st.lists(document_text(), min_size=1, max_size=10))
-@settings(max_examples=100)
 def test_embedding_dimension_consistency_across_multiple_texts(texts):
     """
     For any list of document texts, all generated embeddings should have 
@@ -24,7 +24,6 @@ def text_content(draw):
 
 # Feature: archon-rag-system, Property 12: Embedding generation retry with backoff
 @given(text_content())
-@settings(max_examples=100)
 def test_embedding_retry_with_exponential_backoff(text):
     """
     For any embedding generation failure, the system should retry with 
@@ -65,7 +64,6 @@ def test_embedding_retry_with_exponential_backoff(text):
 
 
 @given(text_content())
-@settings(max_examples=100)
 def test_embedding_retry_exhaustion_raises_error(text):
     """
     For any embedding generation that fails all retries, the system should 
@@ -100,7 +98,7 @@ def test_embedding_retry_exhaustion_raises_error(text):
 
 
 @given(st.integers(min_value=1, max_value=2))
-@settings(max_examples=50)
+@settings(max_examples=min(50, settings.default.max_examples))
 def test_embedding_retry_count_property(failure_count):
     """
     For any number of failures less than max_retries, the system should 
@@ -137,7 +135,6 @@ def test_embedding_retry_count_property(failure_count):
 
 
 @given(text_content())
-@settings(max_examples=100)
 def test_embedding_backoff_timing_increases(text):
     """
     For any embedding generation with retries, the delay between retries 
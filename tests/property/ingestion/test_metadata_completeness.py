@@ -8,7 +8,7 @@ Validates: Requirements 4.2, 4.3
 import os
 import sys
 from unittest.mock import Mock
-from hypothesis import given, strategies as st, settings
+from hypothesis import given, strategies as st
 from datetime import datetime, timezone
 
 
@@ -57,7 +57,6 @@ def document(draw):
 
 # Feature: archon-rag-system, Property 10: Metadata completeness in vector storage
 @given(document())
-@settings(max_examples=100)
 def test_metadata_completeness_in_vector_storage(doc):
     """
     For any document stored in the vector database, the metadata should include 
@@ -118,7 +117,6 @@ def test_metadata_completeness_in_vector_storage(doc):
 
 
 @given(st.lists(document(), min_size=1, max_size=5))
-@settings(max_examples=100)
 def test_metadata_completeness_across_multiple_documents(docs):
     """
     For any list of documents, all vector documents should have complete metadata.
@@ -7,7 +7,7 @@ Validates: Requirements 3.1
 
 import os
 import sys
-from hypothesis import given, strategies as st, settings
+from hypothesis import given, strategies as st
 from unittest.mock import Mock, patch
 from datetime import datetime, timezone
 
@@ -81,7 +81,6 @@ def config_with_repositories(draw):
 
 # Feature: archon-rag-system, Property 5: Complete repository scanning
 @given(config_with_repositories())
-@settings(max_examples=100)
 def test_complete_repository_scanning(config):
     """
     For any list of configured repositories, the monitor should check each 
@@ -131,7 +130,6 @@ def test_complete_repository_scanning(config):
 
 
 @given(config_with_repositories())
-@settings(max_examples=100)
 def test_repository_scanning_order_independence(config):
     """
     For any list of repositories, all should be scanned regardless of order.
@@ -175,7 +173,6 @@ def test_repository_scanning_order_independence(config):
 
 
 @given(config_with_repositories())
-@settings(max_examples=100)
 def test_repository_scanning_with_failures(config):
     """
     For any list of repositories, even if some fail validation, all should 
@@ -7,7 +7,7 @@ Validates: Requirements 3.4
 
 import os
 import sys
-from hypothesis import given, strategies as st, settings
+from hypothesis import given, strategies as st
 from unittest.mock import Mock
 from datetime import datetime, timezone
 
@@ -77,7 +77,6 @@ def config_with_repositories(draw):
 
 # Feature: archon-rag-system, Property 7: Monitoring result completeness
 @given(config_with_repositories())
-@settings(max_examples=100)
 def test_monitoring_result_completeness(config):
     """
     For any monitoring execution, the result should include counts of 
@@ -149,7 +148,6 @@ def test_monitoring_result_completeness(config):
 
 
 @given(config_with_repositories(), st.integers(min_value=0, max_value=10))
-@settings(max_examples=100)
 def test_monitoring_result_tracks_errors(config, num_errors):
     """
     For any monitoring execution with errors, the result should include all 
@@ -200,7 +198,6 @@ def test_monitoring_result_tracks_errors(config, num_errors):
 
 
 @given(config_with_repositories())
-@settings(max_examples=100)
 def test_monitoring_result_counts_accuracy(config):
     """
     For any monitoring execution, the counts in the result should accurately 
@@ -275,7 +272,6 @@ def test_monitoring_result_counts_accuracy(config):
 
 
 @given(config_with_repositories())
-@settings(max_examples=100)
 def test_monitoring_result_execution_time_measured(config):
     """
     For any monitoring execution, the result should include a measured 
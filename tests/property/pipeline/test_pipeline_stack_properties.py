@@ -15,7 +15,7 @@ from pathlib import Path
 from typing import Any, Dict
 
 import pytest
-from hypothesis import given, settings, strategies as st, assume
+from hypothesis import given, strategies as st, assume
 
 
 # Custom strategies for generating valid pipeline configurations
@@ -114,7 +114,6 @@ def simulate_stack_outputs(config: Dict[str, Any]) -> Dict[str, str]:
     }
 
 
-@settings(max_examples=100, deadline=None)
 @given(config=pipeline_config())
 def test_property_1_stack_synthesis_completeness(config):
     """
@@ -140,7 +139,6 @@ def test_property_1_stack_synthesis_completeness(config):
     assert len(output['artifactBucketName']) > 0, "artifactBucketName must not be empty"
 
 
-@settings(max_examples=100, deadline=None)
 @given(config=pipeline_config())
 def test_property_2_configuration_parameter_acceptance(config):
     """
@@ -176,7 +174,6 @@ def test_property_2_configuration_parameter_acceptance(config):
         f"ArtifactBucketName should reference region '{config['region']}'"
 
 
-@settings(max_examples=100, deadline=None)
 @given(config=pipeline_config())
 def test_property_3_cluster_reference_correctness(config):
     """
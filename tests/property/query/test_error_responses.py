@@ -5,35 +5,36 @@ Feature: archon-rag-system, Property 14: Invalid query error responses
 Validates: Requirements 5.4
 """
 
+import re
 from unittest.mock import Mock
-from hypothesis import given, strategies as st, settings
+from hypothesis import assume, given, strategies as st
 
 from query.query_handler import QueryHandler, QueryValidationError, create_error_response
 from query.rag_chain import ArchonRAGChain
 
 
-# Strategy for generating invalid query strings
-@st.composite
-def invalid_query_string(draw):
-    """Generate invalid query strings (empty, whitespace-only, or too long)."""
-    choice = draw(st.integers(min_value=0, max_value=2))
-    
-    if choice == 0:
-        # Empty string
-        return ""
-    elif choice == 1:
-        # Whitespace-only string
-        whitespace_chars = [' ', '\t', '\n', '\r']
-        length = draw(st.integers(min_value=1, max_value=20))
-        return ''.join(draw(st.sampled_from(whitespace_chars)) for _ in range(length))
-    else:
-        # Too long string (> 1000 characters)
-        return draw(st.text(min_size=1001, max_size=2000))
+# Query handler shared by every example; invalid queries are rejected
+# before the mocked RAG chain is ever called
+_handler = QueryHandler(rag_chain=Mock(spec=ArchonRAGChain))
+
+
+# Keywords that make a validation error message helpful
+_HELPFUL_RE = re.compile(r'query|empty|short|long|character|string', re.IGNORECASE)
+
+# Keywords that show an error message is about the input type
+_TYPE_RE = re.compile(r'string|str|type', re.IGNORECASE)
+
+
+# Strategy for generating invalid query strings (empty, whitespace-only, or too long)
+invalid_query_string = st.one_of(
+    st.just(""),
+    st.text(alphabet=' \t\n\r', min_size=1, max_size=20),
+    st.text(min_size=1001, max_size=2000)
+)
 
 
 # Feature: archon-rag-system, Property 14: Invalid query error responses
-@given(invalid_query_string())
-@settings(max_examples=100)
+@given(invalid_query_string)
 def test_invalid_query_returns_error_message(query):
     """
     For any invalid or empty query input, the system should return 
@@ -41,15 +42,9 @@ def test_invalid_query_returns_error_message(query):
     
     Validates: Requirements 5.4
     """
-    # Create mock RAG chain
-    mock_rag_chain = Mock(spec=ArchonRAGChain)
-    
-    # Create query handler
-    handler = QueryHandler(rag_chain=mock_rag_chain)
-    
     # Property: Invalid queries should raise QueryValidationError with a message
     try:
-        handler.handle_query(query)
+        _handler.handle_query(query)
         
         # If no error was raised, check if query is actually valid
         stripped = query.strip()
@@ -67,15 +62,11 @@ def test_invalid_query_returns_error_message(query):
         assert isinstance(error_message, str), "Error message should be a string"
         
         # Property: Error message should be helpful (contain relevant keywords)
-        error_lower = error_message.lower()
-        helpful_keywords = ['query', 'empty', 'short', 'long', 'character', 'string']
-        has_helpful_info = any(keyword in error_lower for keyword in helpful_keywords)
-        assert has_helpful_info, \
+        assert _HELPFUL_RE.search(error_message), \
             f"Error message should contain helpful information: {error_message}"
 
 
-@given(st.text(min_size=0, max_size=2000))
-@settings(max_examples=100)
+@given(invalid_query_string)
 def test_error_response_format(query):
     """
     For any query that causes a validation error, the error response 
@@ -83,23 +74,13 @@ def test_error_response_format(query):
     
     Validates: Requirements 5.4
     """
-    # Create mock RAG chain
-    mock_rag_chain = Mock(spec=ArchonRAGChain)
-    
-    # Create query handler
-    handler = QueryHandler(rag_chain=mock_rag_chain)
-    
-    # Determine if query should be invalid
+    # Long text can strip back to a valid length; discard those draws
     stripped = query.strip()
-    should_be_invalid = not stripped or len(stripped) > 1000
-    
-    if not should_be_invalid:
-        # Skip valid queries for this test
-        return
+    assume(not stripped or len(stripped) > 1000)
     
     # Test error handling
     try:
-        handler.handle_query(query)
+        _handler.handle_query(query)
         # Should have raised an error
         raise AssertionError(f"Invalid query did not raise error: {query!r}")
         
@@ -134,8 +115,7 @@ def test_error_response_format(query):
         assert error_response["timestamp"], "Timestamp must not be empty"
 
 
-@given(st.lists(invalid_query_string(), min_size=1, max_size=10))
-@settings(max_examples=100)
+@given(st.lists(invalid_query_string, min_size=1, max_size=10))
 def test_consistent_error_responses(queries):
     """
     For any list of invalid queries, all error responses should 
@@ -143,18 +123,12 @@ def test_consistent_error_responses(queries):
     
     Validates: Requirements 5.4
     """
-    # Create mock RAG chain
-    mock_rag_chain = Mock(spec=ArchonRAGChain)
-    
-    # Create query handler
-    handler = QueryHandler(rag_chain=mock_rag_chain)
-    
     error_messages = []
     
     # Property: All invalid queries should produce error messages
     for query in queries:
         try:
-            handler.handle_query(query)
+            _handler.handle_query(query)
             # Check if it's actually invalid
             stripped = query.strip()
             if not stripped or len(stripped) > 1000:
@@ -178,7 +152,6 @@ def test_consistent_error_responses(queries):
     st.lists(st.text()),
     st.dictionaries(st.text(), st.text())
 ))
-@settings(max_examples=100)
 def test_non_string_query_error_message(query):
     """
     For any non-string input, the error message should clearly 
@@ -186,31 +159,22 @@ def test_non_string_query_error_message(query):
     
     Validates: Requirements 5.4
     """
-    # Create mock RAG chain
-    mock_rag_chain = Mock(spec=ArchonRAGChain)
-    
-    # Create query handler
-    handler = QueryHandler(rag_chain=mock_rag_chain)
-    
     # Property: Non-string inputs should produce helpful error messages
     try:
-        handler.handle_query(query)
+        _handler.handle_query(query)
         raise AssertionError(f"Non-string query did not raise error: {query!r}")
     except (QueryValidationError, TypeError, AttributeError) as e:
         error_message = str(e)
         
         # Property: Error message should mention string or type
-        error_lower = error_message.lower()
-        type_keywords = ['string', 'str', 'type']
-        has_type_info = any(keyword in error_lower for keyword in type_keywords)
+        has_type_info = _TYPE_RE.search(error_message) is not None
         
         # Allow either explicit type error or validation error
         assert has_type_info or isinstance(e, (TypeError, AttributeError)), \
             f"Error message should indicate type issue: {error_message}"
 
 
-@given(invalid_query_string())
-@settings(max_examples=100)
+@given(invalid_query_string)
 def test_error_response_structure_completeness(query):
     """
     For any invalid query, the error response created by create_error_response 
@@ -218,20 +182,16 @@ def test_error_response_structure_completeness(query):
     
     Validates: Requirements 5.4
     """
-    # Create mock RAG chain
-    mock_rag_chain = Mock(spec=ArchonRAGChain)
-    
-    # Create query handler
-    handler = QueryHandler(rag_chain=mock_rag_chain)
-    
     # Get validation error
     try:
-        handler.validate_query(query)
-        # If no error, skip (query might be valid)
-        return
+        _handler.validate_query(query)
+        error_msg = None
     except QueryValidationError as e:
         error_msg = str(e)
     
+    # Long text can strip back to a valid length; discard those draws
+    assume(error_msg is not None)
+    
     # Create error response
     error_response = create_error_response(
         "INVALID_QUERY",
@@ -6,27 +6,51 @@ Validates: Requirements 6.1
 """
 
 from unittest.mock import Mock, MagicMock
-from hypothesis import given, strategies as st, settings
+from hypothesis import given, strategies as st
 
 from query.rag_chain import ArchonRAGChain
 
 
-# Strategy for generating query strings
-@st.composite
-def query_string(draw):
-    """Generate various query string samples."""
-    # Generate queries of varying lengths
-    query = draw(st.text(
-        alphabet=st.characters(whitelist_categories=('Lu', 'Ll', 'Nd', 'P', 'Z')),
-        min_size=5,
-        max_size=500
-    ))
-    return query
+# Strategy for generating query strings of varying lengths
+query_string = st.text(
+    alphabet=st.characters(whitelist_categories=('Lu', 'Ll', 'Nd', 'P', 'Z')),
+    min_size=5,
+    max_size=500
+)
+
+
+# Expected dimension for Titan embeddings
+EXPECTED_DIMENSION = 1536
+
+# Embedding returned for every query; tests only read it
+_MOCK_EMBEDDING = [0.1] * EXPECTED_DIMENSION
+
+# Mocked components and RAG chain shared by every example
+_mock_vector_store = Mock()
+_mock_vector_store.similarity_search = Mock(return_value=[])
+_mock_vector_store.get_langchain_store = Mock()
+
+# Mock embeddings that return consistent dimensions
+_mock_embeddings = Mock()
+_mock_embeddings.embed_query = Mock(return_value=_MOCK_EMBEDDING)
+
+_mock_llm = Mock()
+
+_rag_chain = ArchonRAGChain(
+    vector_store_manager=_mock_vector_store,
+    embeddings=_mock_embeddings,
+    llm=_mock_llm
+)
+
+
+def _reset_mocks():
+    """Clear calls recorded by the shared mocks in earlier examples."""
+    _mock_embeddings.embed_query.reset_mock()
+    _mock_vector_store.similarity_search.reset_mock()
 
 
 # Feature: archon-rag-system, Property 15: Query embedding generation
-@given(query_string())
-@settings(max_examples=100)
+@given(query_string)
 def test_query_embedding_generation(query):
     """
     For any valid query string, the system should generate an embedding vector 
@@ -34,41 +58,21 @@ def test_query_embedding_generation(query):
     
     Validates: Requirements 6.1
     """
-    # Expected dimension for Titan embeddings
-    EXPECTED_DIMENSION = 1536
-    
-    # Create mock vector store manager
-    mock_vector_store = Mock()
-    mock_vector_store.similarity_search = Mock(return_value=[])
-    mock_vector_store.get_langchain_store = Mock()
-    
-    # Create mock embeddings that return consistent dimensions
-    mock_embeddings = Mock()
-    mock_embeddings.embed_query = Mock(return_value=[0.1] * EXPECTED_DIMENSION)
-    
-    # Create mock LLM
-    mock_llm = Mock()
-    
-    # Create RAG chain with mocked components
-    rag_chain = ArchonRAGChain(
-        vector_store_manager=mock_vector_store,
-        embeddings=mock_embeddings,
-        llm=mock_llm
-    )
+    _reset_mocks()
     
     # Get relevant documents (which internally generates query embedding)
     try:
-        documents = rag_chain.get_relevant_documents(query)
+        documents = _rag_chain.get_relevant_documents(query)
         
         # Verify that embed_query was called with the query
-        mock_embeddings.embed_query.assert_called_once_with(query)
+        _mock_embeddings.embed_query.assert_called_once_with(query)
         
         # Get the embedding that was generated
-        call_args = mock_embeddings.embed_query.call_args
+        call_args = _mock_embeddings.embed_query.call_args
         
         # Verify the embedding was passed to similarity search
-        mock_vector_store.similarity_search.assert_called_once()
-        search_call_args = mock_vector_store.similarity_search.call_args
+        _mock_vector_store.similarity_search.assert_called_once()
+        search_call_args = _mock_vector_store.similarity_search.call_args
         
         # Property: Query embedding must have correct dimensions
         query_vector = search_call_args[1]['query_vector']
@@ -86,8 +90,7 @@ def test_query_embedding_generation(query):
             raise
 
 
-@given(st.lists(query_string(), min_size=1, max_size=10))
-@settings(max_examples=100)
+@given(st.lists(query_string, min_size=1, max_size=10))
 def test_query_embedding_dimension_consistency(queries):
     """
     For any list of query strings, all generated embeddings should have 
@@ -95,35 +98,16 @@ def test_query_embedding_dimension_consistency(queries):
     
     Validates: Requirements 6.1
     """
-    EXPECTED_DIMENSION = 1536
-    
-    # Create mock vector store manager
-    mock_vector_store = Mock()
-    mock_vector_store.similarity_search = Mock(return_value=[])
-    mock_vector_store.get_langchain_store = Mock()
-    
-    # Create mock embeddings that return consistent dimensions
-    mock_embeddings = Mock()
-    mock_embeddings.embed_query = Mock(return_value=[0.1] * EXPECTED_DIMENSION)
-    
-    # Create mock LLM
-    mock_llm = Mock()
-    
-    # Create RAG chain with mocked components
-    rag_chain = ArchonRAGChain(
-        vector_store_manager=mock_vector_store,
-        embeddings=mock_embeddings,
-        llm=mock_llm
-    )
+    _reset_mocks()
     
     # Generate embeddings for all queries
     dimensions = []
     for query in queries:
         try:
-            rag_chain.get_relevant_documents(query)
+            _rag_chain.get_relevant_documents(query)
             
             # Get the embedding dimension from the similarity search call
-            search_call_args = mock_vector_store.similarity_search.call_args
+            search_call_args = _mock_vector_store.similarity_search.call_args
             query_vector = search_call_args[1]['query_vector']
             dimensions.append(len(query_vector))
             
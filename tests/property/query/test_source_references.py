@@ -5,101 +5,134 @@ Feature: archon-rag-system, Property 18: Source reference completeness
 Validates: Requirements 6.5
 """
 
-from unittest.mock import Mock
-from hypothesis import given, strategies as st, settings, assume
+import random
+import string
+import unicodedata
+from typing import NamedTuple
+from hypothesis import HealthCheck, given, settings, strategies as st
 
 from query.query_handler import QueryHandler, SourceReference
-from query.rag_chain import ArchonRAGChain
-
-
-# Strategy for generating source documents with metadata
-@st.composite
-def source_document(draw):
-    """Generate a source document with metadata."""
-    # Generate repository URL
-    org = draw(st.text(
-        alphabet=st.characters(whitelist_categories=('Lu', 'Ll', 'Nd'), min_codepoint=97, max_codepoint=122),
-        min_size=3,
-        max_size=20
-    ))
-    repo = draw(st.text(
-        alphabet=st.characters(whitelist_categories=('Lu', 'Ll', 'Nd'), min_codepoint=97, max_codepoint=122),
-        min_size=3,
-        max_size=20
-    ))
-    repo_url = f"https://github.com/{org}/{repo}"
+
+
+# Query corpus is built once from a fixed seed; strategies sample from it
+_rng = random.Random(0xA11CE)
+_CORPUS_SIZE = 512
+
+# Small, reproducible example budget for properties over the fixed corpora,
+# never above the loaded profile's budget
+_FAST = settings(
+    max_examples=min(25, settings.default.max_examples),
+    derandomize=True,
+    database=None,
+    deadline=None,
+    suppress_health_check=[HealthCheck.too_slow]
+)
+
+# Characters queries are built from: printable ASCII letters, digits,
+# punctuation and space, matching the original character category whitelist
+_ALPHA = ''.join(
+    c for c in map(chr, range(32, 127))
+    if unicodedata.category(c)[0] in {'L', 'N', 'P', 'Z'}
+)
+_LOWER = string.ascii_lowercase
+
+
+def _gen_text(rng, alphabet, min_size, max_size):
+    """Build a string of min_size..max_size characters, favoring short lengths."""
+    upper = max_size if rng.random() < 0.5 else min(max_size, min_size + 20)
+    return ''.join(rng.choices(alphabet, k=rng.randint(min_size, upper)))
+
+
+class _Meta(NamedTuple):
+    """Source document metadata."""
+    repo_url: str
+    file_path: str
+    chunk_index: int
+    last_modified: str
+    document_type: str
+    source_type: str
+
+
+class _Doc(NamedTuple):
+    """Source document as returned by the RAG chain."""
+    metadata: _Meta
+    text: str
+    score: float
+
+
+def _as_dicts(source_docs):
+    """Convert generated documents to the plain dicts the RAG chain returns."""
+    return [{**doc._asdict(), "metadata": doc.metadata._asdict()} for doc in source_docs]
+
+
+def _build_doc(rng):
+    """Build a source document with metadata."""
+    org = _gen_text(rng, _LOWER, 3, 20)
+    repo = _gen_text(rng, _LOWER, 3, 20)
+    path_parts = [_gen_text(rng, _LOWER, 1, 15) for _ in range(rng.randint(1, 5))]
     
-    # Generate file path
-    path_parts = draw(st.lists(
-        st.text(
-            alphabet=st.characters(whitelist_categories=('Lu', 'Ll', 'Nd'), min_codepoint=97, max_codepoint=122),
-            min_size=1,
-            max_size=15
+    return _Doc(
+        metadata=_Meta(
+            repo_url=f"https://github.com/{org}/{repo}",
+            file_path=".kiro/" + "/".join(path_parts) + ".md",
+            chunk_index=rng.randint(0, 100),
+            last_modified="2025-12-09T10:00:00Z",
+            document_type="kiro_doc",
+            source_type="github"
         ),
-        min_size=1,
-        max_size=5
-    ))
-    file_path = ".kiro/" + "/".join(path_parts) + ".md"
-    
-    # Generate score
-    score = draw(st.floats(min_value=0.0, max_value=1.0, allow_nan=False, allow_infinity=False))
+        text=_gen_text(rng, string.printable, 10, 500),
+        score=rng.random()
+    )
+
+
+# Valid queries: 5-200 characters and not whitespace-only
+_VALID_QUERIES = [
+    query
+    for query in (_gen_text(_rng, _ALPHA, 5, 200) for _ in range(_CORPUS_SIZE))
+    if query.strip()
+]
+
+
+class _StubChain:
+    """Minimal stand-in for ArchonRAGChain that returns a fixed result."""
     
-    # Generate text
-    text = draw(st.text(min_size=10, max_size=500))
+    __slots__ = ("invoke",)
     
-    return {
-        "metadata": {
-            "repo_url": repo_url,
-            "file_path": file_path,
-            "chunk_index": draw(st.integers(min_value=0, max_value=100)),
-            "last_modified": "2025-12-09T10:00:00Z",
-            "document_type": "kiro_doc",
-            "source_type": "github"
-        },
-        "text": text,
-        "score": score
-    }
-
-
-# Strategy for generating valid query strings
-@st.composite
-def valid_query_string(draw):
+    def __init__(self, result):
+        self.invoke = lambda *args, **kwargs: result
+
+
+# Stubbed RAG chain and query handler shared by every example. The chain
+# always returns the same result dict; each example swaps in its documents.
+_SCRATCH = {"result": "This is a test answer.", "source_documents": None}
+_handler = QueryHandler(rag_chain=_StubChain(_SCRATCH))
+
+
+def source_document():
+    """Generate a source document with metadata, built from one random draw."""
+    return st.builds(_build_doc, st.randoms(use_true_random=True))
+
+
+def valid_query_string():
     """Generate valid query strings."""
-    query = draw(st.text(
-        alphabet=st.characters(
-            whitelist_categories=('Lu', 'Ll', 'Nd', 'P', 'Z'),
-            min_codepoint=32,
-            max_codepoint=126
-        ),
-        min_size=5,
-        max_size=200
-    ))
-    assume(query.strip())
-    return query
+    return st.sampled_from(_VALID_QUERIES)
 
 
 # Feature: archon-rag-system, Property 18: Source reference completeness
 @given(valid_query_string(), st.lists(source_document(), min_size=1, max_size=10))
-@settings(max_examples=100)
+@_FAST
 def test_source_reference_has_repo_and_path(query, source_docs):
     """
     For any query response, each source reference should include 
-    both repository URL and file path.
+    both a non-empty repository URL and a non-empty file path.
     
     Validates: Requirements 6.5
     """
-    # Create mock RAG chain that returns the source documents
-    mock_rag_chain = Mock(spec=ArchonRAGChain)
-    mock_rag_chain.invoke = Mock(return_value={
-        "result": "This is a test answer.",
-        "source_documents": source_docs
-    })
-    
-    # Create query handler
-    handler = QueryHandler(rag_chain=mock_rag_chain)
+    # Stubbed RAG chain returns the source documents
+    _SCRATCH["source_documents"] = _as_dicts(source_docs)
     
     # Handle query
-    response = handler.handle_query(query)
+    response = _handler.handle_query(query)
     
     # Property: Response should have sources
     assert hasattr(response, 'sources'), "Response must have 'sources' attribute"
@@ -114,6 +147,8 @@ def test_source_reference_has_repo_and_path(query, source_docs):
         assert hasattr(source_ref, 'repo'), "Source reference must have 'repo' field"
         assert source_ref.repo is not None, "Source reference repo must not be None"
         assert isinstance(source_ref.repo, str), "Source reference repo must be a string"
+        assert source_ref.repo, \
+            f"Source reference repo must be non-empty, got: {source_ref.repo!r}"
         
         # Property: Must have file_path field
         assert hasattr(source_ref, 'file_path'), \
@@ -122,10 +157,12 @@ def test_source_reference_has_repo_and_path(query, source_docs):
             "Source reference file_path must not be None"
         assert isinstance(source_ref.file_path, str), \
             "Source reference file_path must be a string"
+        assert source_ref.file_path, \
+            f"Source reference file_path must be non-empty, got: {source_ref.file_path!r}"
 
 
 @given(valid_query_string(), st.lists(source_document(), min_size=1, max_size=10))
-@settings(max_examples=100)
+@_FAST
 def test_source_reference_preserves_metadata(query, source_docs):
     """
     For any query response, source references should preserve the 
@@ -133,18 +170,11 @@ def test_source_reference_preserves_metadata(query, source_docs):
     
     Validates: Requirements 6.5
     """
-    # Create mock RAG chain that returns the source documents
-    mock_rag_chain = Mock(spec=ArchonRAGChain)
-    mock_rag_chain.invoke = Mock(return_value={
-        "result": "This is a test answer.",
-        "source_documents": source_docs
-    })
-    
-    # Create query handler
-    handler = QueryHandler(rag_chain=mock_rag_chain)
+    # Stubbed RAG chain returns the source documents
+    _SCRATCH["source_documents"] = _as_dicts(source_docs)
     
     # Handle query
-    response = handler.handle_query(query)
+    response = _handler.handle_query(query)
     
     # Property: Source references should match original metadata
     assert len(response.sources) <= len(source_docs), \
@@ -152,58 +182,19 @@ def test_source_reference_preserves_metadata(query, source_docs):
     
     for i, source_ref in enumerate(response.sources):
         if i < len(source_docs):
-            original_metadata = source_docs[i]["metadata"]
+            original_metadata = source_docs[i].metadata
             
             # Property: Repo URL should match original
-            assert source_ref.repo == original_metadata["repo_url"], \
-                f"Source reference repo should match original: {source_ref.repo} != {original_metadata['repo_url']}"
+            assert source_ref.repo == original_metadata.repo_url, \
+                f"Source reference repo should match original: {source_ref.repo} != {original_metadata.repo_url}"
             
             # Property: File path should match original
-            assert source_ref.file_path == original_metadata["file_path"], \
-                f"Source reference file_path should match original: {source_ref.file_path} != {original_metadata['file_path']}"
-
-
-@given(valid_query_string(), st.lists(source_document(), min_size=0, max_size=10))
-@settings(max_examples=100)
-def test_all_sources_have_complete_references(query, source_docs):
-    """
-    For any query response with sources, all source references 
-    should be complete with non-empty repo and file_path.
-    
-    Validates: Requirements 6.5
-    """
-    # Create mock RAG chain that returns the source documents
-    mock_rag_chain = Mock(spec=ArchonRAGChain)
-    mock_rag_chain.invoke = Mock(return_value={
-        "result": "This is a test answer.",
-        "source_documents": source_docs
-    })
-    
-    # Create query handler
-    handler = QueryHandler(rag_chain=mock_rag_chain)
-    
-    # Handle query
-    response = handler.handle_query(query)
-    
-    # Property: All source references must be complete
-    for source_ref in response.sources:
-        # Property: Repo must be non-empty
-        assert source_ref.repo, \
-            f"Source reference repo must be non-empty, got: {source_ref.repo!r}"
-        
-        # Property: File path must be non-empty
-        assert source_ref.file_path, \
-            f"Source reference file_path must be non-empty, got: {source_ref.file_path!r}"
-        
-        # Property: Both should be strings
-        assert isinstance(source_ref.repo, str), \
-            f"Source reference repo must be string, got: {type(source_ref.repo)}"
-        assert isinstance(source_ref.file_path, str), \
-            f"Source reference file_path must be string, got: {type(source_ref.file_path)}"
+            assert source_ref.file_path == original_metadata.file_path, \
+                f"Source reference file_path should match original: {source_ref.file_path} != {original_metadata.file_path}"
 
 
 @given(valid_query_string(), st.lists(source_document(), min_size=1, max_size=10))
-@settings(max_examples=100)
+@_FAST
 def test_source_reference_has_relevance_score(query, source_docs):
     """
     For any query response, each source reference should include 
@@ -211,18 +202,11 @@ def test_source_reference_has_relevance_score(query, source_docs):
     
     Validates: Requirements 6.5
     """
-    # Create mock RAG chain that returns the source documents
-    mock_rag_chain = Mock(spec=ArchonRAGChain)
-    mock_rag_chain.invoke = Mock(return_value={
-        "result": "This is a test answer.",
-        "source_documents": source_docs
-    })
-    
-    # Create query handler
-    handler = QueryHandler(rag_chain=mock_rag_chain)
+    # Stubbed RAG chain returns the source documents
+    _SCRATCH["source_documents"] = _as_dicts(source_docs)
     
     # Handle query
-    response = handler.handle_query(query)
+    response = _handler.handle_query(query)
     
     # Property: Each source reference must have relevance_score
     for source_ref in response.sources:
@@ -239,7 +223,7 @@ def test_source_reference_has_relevance_score(query, source_docs):
     st.lists(source_document(), min_size=1, max_size=10),
     st.integers(min_value=1, max_value=5)
 )
-@settings(max_examples=100)
+@_FAST
 def test_source_references_respect_max_results(query, source_docs, max_results):
     """
     For any query with max_results parameter, the number of source 
@@ -247,18 +231,11 @@ def test_source_references_respect_max_results(query, source_docs, max_results):
     
     Validates: Requirements 6.5
     """
-    # Create mock RAG chain that returns the source documents
-    mock_rag_chain = Mock(spec=ArchonRAGChain)
-    mock_rag_chain.invoke = Mock(return_value={
-        "result": "This is a test answer.",
-        "source_documents": source_docs
-    })
-    
-    # Create query handler
-    handler = QueryHandler(rag_chain=mock_rag_chain, max_results=max_results)
+    # Stubbed RAG chain returns the source documents
+    _SCRATCH["source_documents"] = _as_dicts(source_docs)
     
     # Handle query
-    response = handler.handle_query(query)
+    response = _handler.handle_query(query, max_results=max_results)
     
     # Property: Number of sources should not exceed max_results
     assert len(response.sources) <= max_results, \
@@ -271,7 +248,7 @@ def test_source_references_respect_max_results(query, source_docs, max_results):
 
 
 @given(valid_query_string())
-@settings(max_examples=100)
+@_FAST
 def test_empty_sources_handled_correctly(query):
     """
     For any query that returns no source documents, the response 
@@ -279,18 +256,11 @@ def test_empty_sources_handled_correctly(query):
     
     Validates: Requirements 6.5
     """
-    # Create mock RAG chain that returns no sources
-    mock_rag_chain = Mock(spec=ArchonRAGChain)
-    mock_rag_chain.invoke = Mock(return_value={
-        "result": "No relevant documentation found.",
-        "source_documents": []
-    })
-    
-    # Create query handler
-    handler = QueryHandler(rag_chain=mock_rag_chain)
+    # Stubbed RAG chain returns no sources
+    _SCRATCH["source_documents"] = []
     
     # Handle query
-    response = handler.handle_query(query)
+    response = _handler.handle_query(query)
     
     # Property: Sources should be an empty list, not None
     assert response.sources is not None, "Sources should not be None"
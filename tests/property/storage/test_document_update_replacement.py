@@ -8,7 +8,7 @@ Validates: Requirements 4.4
 import os
 import sys
 from datetime import datetime, timedelta
-from hypothesis import given, strategies as st, settings
+from hypothesis import given, strategies as st
 from unittest.mock import MagicMock
 
 
@@ -95,7 +95,6 @@ def create_mock_dynamodb():
 
 # Feature: archon-rag-system, Property 11: Document update replaces previous version
 @given(document_update_sequence())
-@settings(max_examples=100)
 def test_document_update_replaces_previous_version(update_data):
     """
     For any document with the same repo_url and file_path, storing a new version 
@@ -131,7 +130,6 @@ def test_document_update_replaces_previous_version(update_data):
     valid_file_path(),
     st.lists(valid_sha(), min_size=2, max_size=10, unique=True)
 )
-@settings(max_examples=100)
 def test_multiple_updates_maintain_single_entry(repo, file_path, sha_list):
     """
     For any sequence of updates to the same document, the tracker should 
@@ -166,7 +164,6 @@ def test_multiple_updates_maintain_single_entry(repo, file_path, sha_list):
         unique_by=lambda x: (x[0], x[1])  # Unique by repo+file_path
     )
 )
-@settings(max_examples=100)
 def test_different_documents_stored_separately(documents):
     """
     For any set of different documents (different repo or file_path), 
@@ -198,7 +195,6 @@ def test_different_documents_stored_separately(documents):
     valid_sha(),
     valid_sha()
 )
-@settings(max_examples=100)
 def test_update_changes_sha_value(repo, file_path, first_sha, second_sha):
     """
     For any document, updating with a new SHA should change the stored value.
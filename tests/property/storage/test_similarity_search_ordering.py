@@ -8,7 +8,7 @@ Validates: Requirements 6.2
 import os
 import sys
 from unittest.mock import Mock, MagicMock
-from hypothesis import given, strategies as st, settings, assume, HealthCheck
+from hypothesis import given, strategies as st, assume, HealthCheck
 
 
 from storage.vector_store_manager import VectorStoreManager, VectorDocument
@@ -48,7 +48,6 @@ def search_results(draw, min_results=1, max_results=10):
 
 # Feature: archon-rag-system, Property 16: Similarity search ordering
 @given(vector_with_dimension(), st.integers(min_value=1, max_value=20), search_results())
-@settings(max_examples=100)
 def test_similarity_search_results_ordered_by_score(query_vector, k, mock_results):
     """
     For any query embedding, similarity search results should be ordered 
@@ -123,7 +122,6 @@ def test_similarity_search_results_ordered_by_score(query_vector, k, mock_result
 
 
 @given(vector_with_dimension(), st.integers(min_value=1, max_value=5))
-@settings(max_examples=100)
 def test_similarity_search_with_empty_results(query_vector, k):
     """
     For any query embedding, when no results are found, the search should 
@@ -162,7 +160,6 @@ def test_similarity_search_with_empty_results(query_vector, k):
 
 
 @given(vector_with_dimension(), st.integers(min_value=1, max_value=10))
-@settings(max_examples=100)
 def test_similarity_search_with_single_result(query_vector, k):
     """
     For any query embedding, when only one result is found, it should be 
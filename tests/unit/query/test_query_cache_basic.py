@@ -0,0 +1,309 @@
+"""Basic unit tests for QueryCache and its use in ArchonRAGChain."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import numpy as np
+import pytest
+
+# Lambda directory added to path via conftest.py
+
+from query.query_cache import HNSWLIB_AVAILABLE, QueryCache
+from query.rag_chain import ArchonRAGChain, Document
+
+
+def create_rag_chain(cache_max_entries: int = 4):
+    """Create a RAG chain with mocked vector store, embeddings, and LLM."""
+    mock_vector_store = Mock()
+    search_results = [{
+        "text": "Archon uses OpenSearch.",
+        "metadata": {"repo_url": "https://github.com/org/repo", "file_path": ".kiro/doc.md"},
+        "score": 0.9
+    }]
+    mock_vector_store.similarity_search = Mock(return_value=search_results)
+    mock_vector_store.asimilarity_search = AsyncMock(return_value=search_results)
+    
+    mock_embeddings = Mock()
+    mock_embeddings.embed_query = Mock(return_value=[1.0, 0.0, 0.0])
+    mock_embeddings.aembed_query = AsyncMock(return_value=[1.0, 0.0, 0.0])
+    
+    mock_llm = Mock()
+    mock_response = Mock()
+    mock_response.content = "answer"
+    mock_llm.invoke = Mock(return_value=mock_response)
+    mock_llm.ainvoke = AsyncMock(return_value=mock_response)
+    
+    rag_chain = ArchonRAGChain(
+        vector_store_manager=mock_vector_store,
+        embeddings=mock_embeddings,
+        llm=mock_llm,
+        cache_max_entries=cache_max_entries
+    )
+    
+    return rag_chain, mock_embeddings, mock_llm
+
+
+def test_lookup_misses_on_empty_cache():
+    """Test that lookup returns None before anything is cached."""
+    cache = QueryCache()
+    
+    assert cache.lookup([1.0, 0.0]) is None
+
+
+def test_lookup_hits_for_similar_embedding():
+    """Test that a near-identical embedding returns the cached result."""
+    cache = QueryCache(similarity_threshold=0.95)
+    result = {"result": "answer", "source_documents": []}
+    cache.insert([1.0, 0.0, 0.0], result)
+    
+    assert cache.lookup([0.99, 0.01, 0.0]) is result
+
+
+def test_lookup_misses_for_dissimilar_embedding():
+    """Test that an orthogonal embedding does not hit the cache."""
+    cache = QueryCache(similarity_threshold=0.95)
+    cache.insert([1.0, 0.0, 0.0], {"result": "answer", "source_documents": []})
+    
+    assert cache.lookup([0.0, 1.0, 0.0]) is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Test that inserting into a full cache evicts the least recently used entry."""
+    cache = QueryCache(similarity_threshold=0.99, max_entries=2)
+    first = {"result": "first", "source_documents": []}
+    second = {"result": "second", "source_documents": []}
+    third = {"result": "third", "source_documents": []}
+    
+    cache.insert([1.0, 0.0, 0.0], first)
+    cache.insert([0.0, 1.0, 0.0], second)
+    
+    # Touch the first entry so the second becomes least recently used
+    assert cache.lookup([1.0, 0.0, 0.0]) is first
+    
+    cache.insert([0.0, 0.0, 1.0], third)
+    
+    assert len(cache) == 2
+    assert cache.lookup([1.0, 0.0, 0.0]) is first
+    assert cache.lookup([0.0, 1.0, 0.0]) is None
+    assert cache.lookup([0.0, 0.0, 1.0]) is third
+
+
+def test_zero_max_entries_disables_cache():
+    """Test that a cache with no capacity never stores results."""
+    cache = QueryCache(max_entries=0)
+    cache.insert([1.0, 0.0], {"result": "answer", "source_documents": []})
+    
+    assert not cache.enabled
+    assert cache.lookup([1.0, 0.0]) is None
+
+
+def test_invoke_serves_repeated_query_from_cache():
+    """Test that a repeated query does not re-run the QA chain."""
+    rag_chain, _, mock_llm = create_rag_chain()
+    
+    first = rag_chain.invoke("How does ingestion work?")
+    second = rag_chain.invoke("How does ingestion work?")
+    
+    assert mock_llm.invoke.call_count == 1
+    assert second == first
+    assert first["result"] == "answer"
+    assert first["source_documents"][0]["score"] == 0.9
+
+
+def test_cached_results_are_isolated_from_caller_mutation():
+    """Test that modifying a returned result does not change later cache hits."""
+    rag_chain, _, _ = create_rag_chain()
+    
+    first = rag_chain.invoke("How does ingestion work?")
+    first["result"] = "changed"
+    first["source_documents"][0]["score"] = 0.0
+    first["source_documents"][0]["metadata"]["file_path"] = "changed.md"
+    first["source_documents"].clear()
+    
+    # Exact and semantic hits both return fresh copies
+    for query in ("How does ingestion work?", "What is ingestion?"):
+        hit = rag_chain.invoke(query)
+        assert hit is not first
+        assert hit["result"] == "answer"
+        assert hit["source_documents"][0]["score"] == 0.9
+        assert hit["source_documents"][0]["metadata"]["file_path"] == ".kiro/doc.md"
+        hit["source_documents"].clear()
+    
+    assert rag_chain.invoke("How does ingestion work?")["source_documents"]
+
+
+def test_invoke_without_cache_runs_chain_every_time():
+    """Test that a disabled cache runs retrieval and the LLM for every query."""
+    rag_chain, mock_embeddings, mock_llm = create_rag_chain(cache_max_entries=0)
+    
+    rag_chain.invoke("How does ingestion work?")
+    rag_chain.invoke("How does ingestion work?")
+    
+    assert mock_llm.invoke.call_count == 2
+    assert mock_embeddings.embed_query.call_count == 2
+
+
+def test_exact_lookup_ignores_case_and_whitespace():
+    """Test that the exact tier matches normalized query text."""
+    cache = QueryCache()
+    result = {"result": "answer", "source_documents": []}
+    cache.insert_exact("How does ingestion work?", result)
+    
+    assert cache.lookup_exact("  how does INGESTION work?\n") is result
+    assert cache.lookup_exact("How does querying work?") is None
+
+
+def test_exact_tier_evicts_least_recently_used():
+    """Test that the exact tier is bounded by max_entries."""
+    cache = QueryCache(max_entries=2)
+    cache.insert_exact("first", {"result": "first"})
+    cache.insert_exact("second", {"result": "second"})
+    cache.lookup_exact("first")
+    cache.insert_exact("third", {"result": "third"})
+    
+    assert cache.lookup_exact("first") is not None
+    assert cache.lookup_exact("second") is None
+    assert cache.lookup_exact("third") is not None
+
+
+def test_invoke_exact_repeat_skips_embedding():
+    """Test that an exact repeat is answered without embedding the query."""
+    rag_chain, mock_embeddings, mock_llm = create_rag_chain()
+    
+    rag_chain.invoke("How does ingestion work?")
+    rag_chain.invoke("how does ingestion work?")
+    
+    assert mock_embeddings.embed_query.call_count == 1
+    assert mock_llm.invoke.call_count == 1
+
+
+def test_invoke_embeds_query_once_per_miss():
+    """Test that a cache miss embeds the query once and searches with that vector."""
+    rag_chain, mock_embeddings, _ = create_rag_chain()
+    
+    rag_chain.invoke("How does ingestion work?")
+    
+    mock_embeddings.embed_query.assert_called_once_with("How does ingestion work?")
+    search_kwargs = rag_chain.vector_store_manager.similarity_search.call_args[1]
+    assert search_kwargs["query_vector"] == [1.0, 0.0, 0.0]
+
+
+def test_batch_retrieval_embeds_and_searches_once():
+    """Test that batch retrieval uses one embedding call and one multi-search."""
+    rag_chain, mock_embeddings, _ = create_rag_chain()
+    mock_embeddings.embed_documents = Mock(return_value=[[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+    rag_chain.vector_store_manager.similarity_search_batch = Mock(return_value=[
+        [{"text": "first", "metadata": {}, "score": 0.8}],
+        []
+    ])
+    
+    results = rag_chain.get_relevant_documents_batch(["first query", "second query"])
+    
+    mock_embeddings.embed_documents.assert_called_once_with(["first query", "second query"])
+    rag_chain.vector_store_manager.similarity_search_batch.assert_called_once()
+    assert [len(docs) for docs in results] == [1, 0]
+    assert results[0][0].text == "first"
+
+
+def test_ainvoke_matches_invoke():
+    """Test that ainvoke awaits each stage and returns the same result shape as invoke."""
+    rag_chain, mock_embeddings, mock_llm = create_rag_chain(cache_max_entries=0)
+    
+    result = asyncio.run(rag_chain.ainvoke("What is Archon?"))
+    
+    assert result == rag_chain.invoke("What is Archon?")
+    mock_embeddings.aembed_query.assert_awaited_once_with("What is Archon?")
+    mock_llm.ainvoke.assert_awaited_once()
+
+
+def test_ainvoke_serves_repeated_query_from_cache():
+    """Test that ainvoke shares the cache with invoke."""
+    rag_chain, mock_embeddings, mock_llm = create_rag_chain()
+    
+    first = rag_chain.invoke("What is Archon?")
+    second = asyncio.run(rag_chain.ainvoke("What is Archon?"))
+    
+    assert second == first
+    mock_embeddings.aembed_query.assert_not_awaited()
+    mock_llm.ainvoke.assert_not_awaited()
+
+
+def test_invoke_stream_yields_fragments_and_caches_result():
+    """Test that invoke_stream yields LLM chunks and caches the joined answer."""
+    rag_chain, mock_embeddings, mock_llm = create_rag_chain()
+    chunks = []
+    for text in ["Archon ", "uses ", "OpenSearch."]:
+        chunk = Mock()
+        chunk.content = text
+        chunks.append(chunk)
+    mock_llm.stream = Mock(return_value=iter(chunks))
+    
+    fragments = list(rag_chain.invoke_stream("What is Archon?"))
+    
+    assert fragments == ["Archon ", "uses ", "OpenSearch."]
+    assert rag_chain.invoke("What is Archon?")["result"] == "Archon uses OpenSearch."
+    mock_llm.invoke.assert_not_called()
+
+
+def test_get_relevant_documents_reuses_precomputed_embedding():
+    """Test that a supplied query embedding skips the embedding call."""
+    rag_chain, mock_embeddings, _ = create_rag_chain()
+    
+    documents = rag_chain.get_relevant_documents("What is Archon?", query_embedding=[0.0, 1.0, 0.0])
+    
+    assert len(documents) == 1
+    mock_embeddings.embed_query.assert_not_called()
+    rag_chain.vector_store_manager.similarity_search.assert_called_once_with(
+        query_vector=[0.0, 1.0, 0.0],
+        k=rag_chain.retrieval_k
+    )
+
+
+def test_default_prompt_matches_template_format():
+    """Test that the precomputed default prompt equals formatting the template."""
+    rag_chain, _, _ = create_rag_chain()
+    context = [Document(text="Uses {question} braces", metadata={"repo_url": "r", "file_path": "f"}, score=0.9)]
+    
+    prompt = rag_chain._format_prompt("What is {context}?", context)
+    
+    assert prompt == ArchonRAGChain.DEFAULT_PROMPT_TEMPLATE.format(
+        context="Document 1 (from r/f):\nUses {question} braces",
+        question="What is {context}?"
+    )
+
+
+@pytest.mark.skipif(not HNSWLIB_AVAILABLE, reason="hnswlib not installed")
+def test_large_cache_uses_ann_index():
+    """Test that lookups past ANN_MIN_ENTRIES go through the HNSW index and stay correct."""
+    dimension = 16
+    count = QueryCache.ANN_MIN_ENTRIES + 8
+    cache = QueryCache(similarity_threshold=0.99, max_entries=count)
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((count, dimension)).astype(np.float32)
+    results = [{"result": str(i), "source_documents": []} for i in range(count)]
+    
+    for embedding, result in zip(embeddings, results):
+        cache.insert(embedding.tolist(), result)
+    
+    assert cache._ann is not None
+    assert cache.lookup(embeddings[7].tolist()) is results[7]
+    assert cache.lookup(embeddings[-1].tolist()) is results[-1]
+
+
+@pytest.mark.skipif(not HNSWLIB_AVAILABLE, reason="hnswlib not installed")
+def test_default_cache_size_turns_on_ann_index():
+    """Test that a chain built with the default cache size switches to the HNSW index."""
+    from query.query_handler import CACHE_MAX
+    
+    assert CACHE_MAX == QueryCache.DEFAULT_MAX_ENTRIES > QueryCache.ANN_MIN_ENTRIES
+    
+    rag_chain, mock_embeddings, _ = create_rag_chain(cache_max_entries=CACHE_MAX)
+    count = QueryCache.ANN_MIN_ENTRIES + 1
+    embeddings = np.random.default_rng(0).standard_normal((count, 16)).astype(np.float32)
+    mock_embeddings.embed_query = Mock(side_effect=embeddings.tolist())
+    
+    for i in range(count):
+        rag_chain.invoke(f"Question number {i}?")
+    
+    assert rag_chain._cache._ann is not None
+    assert rag_chain._cache.lookup(embeddings[7].tolist()) is not None
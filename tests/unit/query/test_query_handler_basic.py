@@ -0,0 +1,104 @@
+"""Basic unit tests for QueryHandler and lambda_handler."""
+
+import json
+from dataclasses import asdict
+from unittest.mock import Mock
+
+# Lambda directory added to path via conftest.py
+
+from query.query_handler import (
+    QueryHandler,
+    QueryResponse,
+    SourceReference,
+    _to_json,
+    create_error_response,
+    lambda_handler,
+    MAX_BODY_BYTES,
+)
+
+
+def test_response_json_matches_asdict():
+    """Test that a serialized QueryResponse matches its asdict form."""
+    response = QueryResponse(
+        answer="Archon uses OpenSearch.",
+        sources=[
+            SourceReference(
+                repo="https://github.com/org/repo",
+                file_path=".kiro/doc.md",
+                relevance_score=0.9,
+                chunk_text="Some \"quoted\" text"
+            )
+        ],
+        timestamp="2024-01-01T00:00:00Z",
+        query="What is Archon?"
+    )
+    
+    assert json.loads(_to_json(response)) == asdict(response)
+
+
+def test_error_response_json_round_trips():
+    """Test that an error response serializes to the same dictionary."""
+    error_response = create_error_response("INVALID_QUERY", "Query cannot be empty", "details")
+    
+    assert json.loads(_to_json(error_response)) == error_response
+
+
+def test_oversized_body_is_rejected_before_parsing():
+    """Test that a body over the size limit returns 413."""
+    event = {"body": "{" + "x" * MAX_BODY_BYTES + "}"}
+    
+    response = lambda_handler(event, None)
+    
+    assert response["statusCode"] == 413
+    assert json.loads(response["body"])["error"]["code"] == "PAYLOAD_TOO_LARGE"
+
+
+def test_invalid_json_body_returns_400():
+    """Test that malformed JSON returns an INVALID_REQUEST error."""
+    response = lambda_handler({"body": "{not json"}, None)
+    
+    assert response["statusCode"] == 400
+    assert json.loads(response["body"])["error"]["code"] == "INVALID_REQUEST"
+
+
+def test_chunk_text_truncated_by_default_and_full_on_request():
+    """Test chunk text truncation and the include_chunks override."""
+    handler = QueryHandler(rag_chain=Mock(), max_chunk_chars=4)
+    sources = [{"text": "abcdefgh", "metadata": {"repo_url": "r", "file_path": "f"}, "score": 0.5}]
+    
+    assert handler.format_response("a", sources, "q").sources[0].chunk_text == "abcd"
+    assert handler.format_response("a", sources, "q", include_chunks=True).sources[0].chunk_text == "abcdefgh"
+    assert handler.format_response("a", sources, "q", include_chunks=False).sources[0].chunk_text is None
+
+
+def test_chunk_text_omitted_when_disabled():
+    """Test that include_chunk_text=False omits chunk text by default."""
+    handler = QueryHandler(rag_chain=Mock(), include_chunk_text=False)
+    sources = [{"text": "abcdefgh", "metadata": {}, "score": 0.5}]
+    
+    assert handler.format_response("a", sources, "q").sources[0].chunk_text is None
+
+
+def test_non_boolean_include_chunks_returns_400():
+    """Test that include_chunks must be a JSON boolean."""
+    for value in ("false", 0, 1, [], {}):
+        response = lambda_handler({"body": json.dumps({"query": "q", "include_chunks": value})}, None)
+        
+        assert response["statusCode"] == 400
+        assert json.loads(response["body"])["error"]["code"] == "INVALID_REQUEST"
+    
+    for value in (True, False, None):
+        response = lambda_handler({"body": json.dumps({"query": "q", "include_chunks": value})}, None)
+        
+        assert json.loads(response["body"])["error"]["code"] != "INVALID_REQUEST"
+
+
+def test_body_size_limit_counts_utf8_bytes():
+    """Test that a multi-byte body over the byte limit is rejected even if its character count is under it."""
+    query = "é" * (MAX_BODY_BYTES // 2)
+    event = {"body": json.dumps({"query": query}, ensure_ascii=False)}
+    assert len(event["body"]) <= MAX_BODY_BYTES
+    
+    response = lambda_handler(event, None)
+    
+    assert response["statusCode"] == 413
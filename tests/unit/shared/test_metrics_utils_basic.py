@@ -0,0 +1,366 @@
+"""Basic unit tests for CloudWatch metrics publishing."""
+
+import gc
+import io
+import json
+import threading
+import weakref
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import shared.metrics_utils as metrics_utils
+
+from botocore.exceptions import ClientError
+
+# Lambda directory added to path via conftest.py
+
+from shared.metrics_utils import (
+    EMF_MAX_METRICS,
+    EMF_MAX_VALUES,
+    EMFMetricsPublisher,
+    MAX_BATCH_SIZE,
+    MAX_PAYLOAD_BYTES,
+    MAX_PUT_ATTEMPTS,
+    MAX_VALUES_PER_DATUM,
+    MetricsPublisher,
+    _TokenBucket,
+    _estimate_datum_bytes,
+    _to_datum,
+    get_metrics_publisher,
+)
+
+
+class StubCloudWatch:
+    """CloudWatch client stub that records PutMetricData calls."""
+    
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+    
+        self.threads = set()
+    
+    def put_metric_data(self, Namespace, MetricData):
+        with self._lock:
+            self.calls.append((Namespace, MetricData))
+            self.threads.add(threading.current_thread().name)
+
+
+class FailingCloudWatch(StubCloudWatch):
+    """CloudWatch client stub that fails the first calls with an error code."""
+    
+    def __init__(self, error_code, failures):
+        super().__init__()
+        self.error_code = error_code
+        self.failures = failures
+        self.attempts = 0
+    
+    def put_metric_data(self, Namespace, MetricData):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise ClientError({'Error': {'Code': self.error_code, 'Message': 'fail'}}, 'PutMetricData')
+        super().put_metric_data(Namespace, MetricData)
+
+
+class FakeClock:
+    """Stand-in for the time module whose sleep() advances monotonic() instantly."""
+    
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+    
+    def monotonic(self):
+        return self.now
+    
+    def time(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def published_datums(client):
+    """Flatten every datum sent to the stub client."""
+    return [datum for _, metric_data in client.calls for datum in metric_data]
+
+
+TIMESTAMP = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def test_single_value_is_sent_as_value():
+    """Test that a metric recorded once becomes a plain Value datum."""
+    datum = _to_datum('QueryLatency', 'Seconds', [], [0.5], TIMESTAMP)
+    
+    assert datum['Value'] == 0.5
+    assert 'Values' not in datum and 'StatisticValues' not in datum
+
+
+def test_repeated_values_are_sent_as_values_and_counts():
+    """Test that repeated values collapse into Values/Counts."""
+    datum = _to_datum('QueryLatency', 'Seconds', [], [0.5, 1.0, 0.5, 0.5], TIMESTAMP)
+    
+    assert dict(zip(datum['Values'], datum['Counts'])) == {0.5: 3.0, 1.0: 1.0}
+    assert 'StatisticValues' not in datum
+
+
+def test_many_distinct_values_are_sent_as_statistic_values():
+    """Test that too many distinct values fall back to StatisticValues."""
+    values = [float(i) for i in range(MAX_VALUES_PER_DATUM + 1)]
+    
+    datum = _to_datum('QueryLatency', 'Seconds', [], values, TIMESTAMP)
+    
+    assert 'Values' not in datum
+    assert datum['StatisticValues'] == {
+        'SampleCount': float(len(values)),
+        'Sum': float(sum(values)),
+        'Minimum': 0.0,
+        'Maximum': float(MAX_VALUES_PER_DATUM)
+    }
+
+
+def test_flush_aggregates_one_datum_per_name_and_dimensions():
+    """Test that a flush sends one datum per metric name and dimension set."""
+    client = StubCloudWatch()
+    publisher = MetricsPublisher(cloudwatch_client=client, environment='test')
+    
+    publisher.record_queries_processed()
+    publisher.record_queries_processed()
+    publisher.record_query_errors(error_type='Timeout')
+    publisher.record_query_errors(error_type='Validation')
+    publisher.flush(timeout=5)
+    publisher.close()
+    
+    assert len(client.calls) == 1
+    namespace, metric_data = client.calls[0]
+    assert namespace == 'Archon'
+    
+    by_key = {
+        (datum['MetricName'], tuple((d['Name'], d['Value']) for d in datum['Dimensions'])): datum
+        for datum in metric_data
+    }
+    assert len(by_key) == 3
+    assert by_key[('QueriesProcessed', (('Environment', 'test'),))]['Values'] == [1]
+    assert by_key[('QueriesProcessed', (('Environment', 'test'),))]['Counts'] == [2.0]
+    assert by_key[('QueryErrors', (('ErrorType', 'Timeout'), ('Environment', 'test')))]['Value'] == 1
+    assert by_key[('QueryErrors', (('ErrorType', 'Validation'), ('Environment', 'test')))]['Value'] == 1
+
+
+def test_large_flush_is_split_into_parallel_calls_within_limits():
+    """Test that a flush over the payload limit is split and sent from the flush pool."""
+    client = StubCloudWatch()
+    publisher = MetricsPublisher(cloudwatch_client=client)
+    dimensions = {'Blob': 'x' * 10_000}
+    
+    for i in range(200):
+        publisher.put_metric(f'Metric{i}', 1.0, 'Count', dimensions)
+    publisher.flush(timeout=10)
+    publisher.close()
+    
+    assert len(client.calls) > 1
+    assert all(name.startswith('cw-flush') for name in client.threads)
+    assert sum(len(metric_data) for _, metric_data in client.calls) == 200
+    for _, metric_data in client.calls:
+        assert len(metric_data) <= MAX_BATCH_SIZE
+        payload_bytes = sum(
+            _estimate_datum_bytes(
+                datum['MetricName'],
+                ((d['Name'], d['Value']) for d in datum['Dimensions'])
+            )
+            for datum in metric_data
+        )
+        assert payload_bytes <= MAX_PAYLOAD_BYTES
+
+
+def test_token_bucket_allows_burst_then_waits_for_refill():
+    """Test that the token bucket allows a burst of rate calls, then paces the rest."""
+    clock = FakeClock()
+    with patch('shared.metrics_utils.time', clock):
+        bucket = _TokenBucket(rate=4)
+        
+        for _ in range(4):
+            bucket.acquire()
+        assert clock.sleeps == []
+        
+        bucket.acquire()
+        assert clock.sleeps == [0.25]
+        
+        clock.now += 1.0
+        for _ in range(4):
+            bucket.acquire()
+        assert clock.sleeps == [0.25]
+
+
+def test_throttled_call_is_retried_with_backoff():
+    """Test that throttled calls are retried until they succeed."""
+    client = FailingCloudWatch('Throttling', failures=2)
+    datum = _to_datum('QueriesProcessed', 'Count', [], [1], TIMESTAMP)
+    clock = FakeClock()
+    
+    with patch('shared.metrics_utils.time', clock):
+        publisher = MetricsPublisher(cloudwatch_client=client)
+        publisher._put_metric_data([datum])
+    
+    assert client.attempts == 3
+    assert client.calls == [('Archon', [datum])]
+    assert len(clock.sleeps) == 2
+    assert 0 <= clock.sleeps[0] <= 0.1 and 0 <= clock.sleeps[1] <= 0.2
+    assert publisher._dropped == 0
+
+
+def test_persistent_throttling_counts_datums_as_dropped():
+    """Test that a call throttled on every attempt is reported as dropped metrics."""
+    client = FailingCloudWatch('ThrottlingException', failures=MAX_PUT_ATTEMPTS)
+    datums = [_to_datum(f'Metric{i}', 'Count', [], [1], TIMESTAMP) for i in range(3)]
+    
+    with patch('shared.metrics_utils.time', FakeClock()):
+        publisher = MetricsPublisher(cloudwatch_client=client)
+        publisher._put_metric_data(datums)
+        assert client.attempts == MAX_PUT_ATTEMPTS
+        
+        publisher.flush()
+    
+    (_, metric_data), = client.calls
+    assert metric_data[0]['MetricName'] == 'MetricsDropped'
+    assert metric_data[0]['Value'] == 3
+
+
+def test_non_throttling_error_is_not_retried():
+    """Test that errors other than throttling fail the call immediately."""
+    client = FailingCloudWatch('InvalidParameterValue', failures=1)
+    clock = FakeClock()
+    
+    with patch('shared.metrics_utils.time', clock):
+        publisher = MetricsPublisher(cloudwatch_client=client)
+        publisher._put_metric_data([_to_datum('QueriesProcessed', 'Count', [], [1], TIMESTAMP)])
+    
+    assert client.attempts == 1
+    assert clock.sleeps == []
+    assert publisher._dropped == 1
+
+
+def test_concurrent_drops_are_all_counted():
+    """Test that metrics dropped from many threads are all reported."""
+    client = StubCloudWatch()
+    publisher = MetricsPublisher(cloudwatch_client=client, max_queue_size=1)
+    # Keep the worker from draining the queue so every put after the first is dropped
+    publisher._worker = threading.current_thread()
+    
+    def record_many():
+        for _ in range(1000):
+            publisher.record_queries_processed()
+    
+    threads = [threading.Thread(target=record_many) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    publisher._worker = None
+    publisher.flush()
+    
+    dropped = [d for d in published_datums(client) if d['MetricName'] == 'MetricsDropped']
+    assert dropped[0]['Value'] == 8 * 1000 - 1
+
+
+def test_publisher_with_running_worker_can_be_collected():
+    """Test that starting the worker does not keep the publisher alive."""
+    client = StubCloudWatch()
+    publisher = MetricsPublisher(cloudwatch_client=client, flush_interval=0.05)
+    publisher.record_queries_processed()
+    publisher.flush(timeout=5)
+    worker = publisher._worker
+    
+    publisher_ref = weakref.ref(publisher)
+    del publisher
+    gc.collect()
+    
+    assert publisher_ref() is None
+    worker.join(timeout=5)
+    assert not worker.is_alive()
+    assert published_datums(client)[0]['MetricName'] == 'QueriesProcessed'
+
+
+def emf_documents(stream):
+    """Parse the EMF documents written to a stream."""
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_emf_publisher_writes_one_document_per_dimension_set():
+    """Test that EMF output groups metrics by dimension set with valid metadata."""
+    stream = io.StringIO()
+    publisher = EMFMetricsPublisher(environment='test', stream=stream)
+    
+    publisher.record_queries_processed()
+    publisher.record_query_latency(0.5)
+    publisher.record_query_latency(1.5)
+    publisher.record_query_errors(error_type='Timeout')
+    publisher.flush(timeout=5)
+    publisher.close()
+    
+    documents = {
+        tuple(document['_aws']['CloudWatchMetrics'][0]['Dimensions'][0]): document
+        for document in emf_documents(stream)
+    }
+    assert set(documents) == {('Environment',), ('ErrorType', 'Environment')}
+    
+    plain = documents[('Environment',)]
+    assert plain['Environment'] == 'test'
+    assert plain['QueriesProcessed'] == 1
+    assert plain['QueryLatency'] == [0.5, 1.5]
+    directive = plain['_aws']['CloudWatchMetrics'][0]
+    assert directive['Namespace'] == 'Archon'
+    assert sorted(directive['Metrics'], key=lambda m: m['Name']) == [
+        {'Name': 'QueriesProcessed', 'Unit': 'Count'},
+        {'Name': 'QueryLatency', 'Unit': 'Seconds'}
+    ]
+    assert isinstance(plain['_aws']['Timestamp'], int)
+    
+    errors = documents[('ErrorType', 'Environment')]
+    assert errors['ErrorType'] == 'Timeout'
+    assert errors['QueryErrors'] == 1
+
+
+def test_emf_publisher_splits_documents_at_format_limits():
+    """Test that EMF documents stay within the metric and value limits."""
+    stream = io.StringIO()
+    publisher = EMFMetricsPublisher(stream=stream)
+    
+    for i in range(EMF_MAX_METRICS + 1):
+        publisher.put_metric(f'Metric{i}', 1.0, 'Count')
+    for i in range(EMF_MAX_VALUES + 1):
+        publisher.put_metric('Latency', float(i), 'Seconds')
+    publisher.flush(timeout=5)
+    publisher.close()
+    
+    documents = emf_documents(stream)
+    for document in documents:
+        definitions = document['_aws']['CloudWatchMetrics'][0]['Metrics']
+        assert len(definitions) <= EMF_MAX_METRICS
+        for definition in definitions:
+            value = document[definition['Name']]
+            assert not isinstance(value, list) or len(value) <= EMF_MAX_VALUES
+    
+    names = [
+        definition['Name']
+        for document in documents
+        for definition in document['_aws']['CloudWatchMetrics'][0]['Metrics']
+    ]
+    assert len(set(names)) == EMF_MAX_METRICS + 2
+    
+    latency = []
+    for document in documents:
+        value = document.get('Latency', [])
+        latency.extend(value if isinstance(value, list) else [value])
+    assert latency == [float(i) for i in range(EMF_MAX_VALUES + 1)]
+
+
+def test_metrics_mode_selects_publisher():
+    """Test that METRICS_MODE chooses between EMF and PutMetricData publishing."""
+    try:
+        for mode, expected in (('emf', EMFMetricsPublisher), ('api', MetricsPublisher)):
+            metrics_utils._publisher = None
+            with patch.dict('os.environ', {'METRICS_MODE': mode}), \
+                    patch.object(MetricsPublisher, '_create_cloudwatch_client', return_value=StubCloudWatch()):
+                assert type(get_metrics_publisher()) is expected
+    finally:
+        metrics_utils._publisher = None
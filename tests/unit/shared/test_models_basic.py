@@ -0,0 +1,198 @@
+"""Basic unit tests for shared data models."""
+
+import copy
+import hashlib
+import json
+import os
+import pickle
+import subprocess
+import sys
+from dataclasses import asdict
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+# Lambda directory added to path via conftest.py
+
+from shared.models import (
+    Document,
+    DocumentChunk,
+    MonitoringResult,
+    QueryResponse,
+    RepositoryConfig,
+    SourceReference,
+    VectorDocument,
+)
+
+
+# Lambda source directory, for running snippets in a subprocess
+LAMBDA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'lambda'))
+
+
+def create_document():
+    """Create a valid document for tests."""
+    return Document(
+        repo_url="https://github.com/org/repo",
+        file_path=".kiro/docs/guide.md",
+        content="# Guide\n\nSome content.",
+        sha="abc123",
+        last_modified=datetime(2024, 1, 1, tzinfo=timezone.utc)
+    )
+
+
+def test_chunk_id_matches_full_hash():
+    """Test that chunk IDs hash repo_url#file_path#chunk_index."""
+    document = create_document()
+    chunk = DocumentChunk(document=document, chunk_index=3, text="Some", start_char=0, end_char=4)
+    
+    expected = hashlib.sha256(
+        f"{document.repo_url}#{document.file_path}#3".encode()
+    ).hexdigest()
+    assert chunk.generate_id() == expected
+
+
+def test_document_pickles_and_copies_after_generating_ids():
+    """Test that generating chunk IDs leaves documents picklable and copyable."""
+    document = create_document()
+    chunk = DocumentChunk(document=document, chunk_index=0, text="# Guide", start_char=0, end_char=7)
+    chunk_id = chunk.generate_id()
+    
+    assert pickle.loads(pickle.dumps(document)) == document
+    assert copy.deepcopy(document) == document
+    assert asdict(document)["repo_url"] == document.repo_url
+    
+    restored = pickle.loads(pickle.dumps(chunk))
+    assert restored == chunk
+    assert restored.generate_id() == chunk_id
+    assert copy.deepcopy(chunk).generate_id() == chunk_id
+
+
+def test_valid_models_pass_validation():
+    """Test that well-formed models validate."""
+    document = create_document()
+    source = SourceReference(repo="https://github.com/org/repo", file_path="a.md", relevance_score=0.5)
+    
+    assert document.validate()
+    assert DocumentChunk(document=document, chunk_index=0, text="x", start_char=0, end_char=1).validate()
+    assert RepositoryConfig(url="https://github.com/org/repo", branch="main", paths=[".kiro/"]).validate()
+    assert source.validate()
+    assert QueryResponse(answer="a", sources=[source], timestamp="2024-01-01T00:00:00Z", query="q").validate()
+    assert MonitoringResult(
+        repositories_checked=1,
+        documents_processed=2,
+        documents_updated=1,
+        errors=[],
+        execution_time=0.5
+    ).validate()
+
+
+@pytest.mark.parametrize("model, message", [
+    (lambda: Document(
+        repo_url="", file_path="a.md", content="", sha="abc",
+        last_modified=datetime(2024, 1, 1)
+    ), "repo_url must be a non-empty string"),
+    (lambda: Document(
+        repo_url="r", file_path="a.md", content="", sha="abc",
+        last_modified="2024-01-01"
+    ), "last_modified must be a datetime object"),
+    (lambda: DocumentChunk(
+        document=create_document(), chunk_index=-1, text="", start_char=0, end_char=0
+    ), "chunk_index must be a non-negative integer"),
+    (lambda: DocumentChunk(
+        document=create_document(), chunk_index=0, text="", start_char=5, end_char=1
+    ), "end_char must be >= start_char"),
+    (lambda: RepositoryConfig(url="r", branch="main", paths=[]), "paths must contain at least one path"),
+    (lambda: RepositoryConfig(url="r", branch="main", paths=[1]), "all paths must be strings"),
+    (lambda: SourceReference(repo="r", file_path="a.md", relevance_score="high"),
+     "relevance_score must be a number"),
+    (lambda: SourceReference(repo="r", file_path="a.md", relevance_score=-0.1),
+     "relevance_score must be non-negative"),
+    (lambda: QueryResponse(answer="a", sources=[{"repo": "r"}], timestamp="t", query="q"),
+     "all sources must be SourceReference instances"),
+    (lambda: QueryResponse(
+        answer="a",
+        sources=[SourceReference(repo="", file_path="a.md", relevance_score=0.1)],
+        timestamp="t",
+        query="q"
+    ), "repo must be a non-empty string"),
+    (lambda: MonitoringResult(
+        repositories_checked=0, documents_processed=0, documents_updated=0,
+        errors=[None], execution_time=0.0
+    ), "all errors must be strings"),
+    (lambda: VectorDocument(id="v", vector=[], metadata={"repo_url": "r", "file_path": "a.md"}, text=""),
+     "vector must not be empty"),
+    (lambda: VectorDocument(id="v", vector=[0.1, "x"], metadata={"repo_url": "r", "file_path": "a.md"}, text=""),
+     "all vector values must be numbers"),
+    (lambda: VectorDocument(id="v", vector=[0.1], metadata={"repo_url": "r"}, text=""),
+     "metadata must contain 'file_path' field"),
+])
+def test_schema_violations_raise_value_error(model, message):
+    """Test that each schema check raises its own message."""
+    with pytest.raises(ValueError, match=message):
+        model().validate()
+
+
+def test_only_vector_validation_is_skipped_under_optimize():
+    """Test that python -O skips VectorDocument validation but not the other models."""
+    script = (
+        "from shared.models import QueryResponse, VectorDocument\n"
+        "VectorDocument(id='', vector=[], metadata={}, text='').validate()\n"
+        "try:\n"
+        "    QueryResponse(answer='a', sources=None, timestamp='', query='q').validate()\n"
+        "except ValueError:\n"
+        "    print('rejected')\n"
+    )
+    
+    result = subprocess.run(
+        [sys.executable, "-O", "-c", script],
+        cwd=LAMBDA_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    
+    assert result.stdout.strip() == "rejected"
+
+
+def test_fp32_vector_round_trips_through_dict_and_json():
+    """Test that FP32 vectors serialize to their exact widened values and round-trip."""
+    embedding = [0.1, -0.25, 1 / 3, 1e-7, 123456.789]
+    document = VectorDocument.from_embedding(
+        id="v",
+        embedding=embedding,
+        metadata={"repo_url": "r", "file_path": "a.md"},
+        text="t"
+    )
+    
+    serialized = document.to_dict()["vector"]
+    assert serialized == np.asarray(embedding, dtype=np.float32).tolist()
+    assert all(abs(value - original) <= abs(original) * 1e-7 for value, original in zip(serialized, embedding))
+    
+    restored = VectorDocument.from_dict(json.loads(json.dumps(document.to_dict())))
+    assert restored.vector == document.vector
+    assert restored.to_dict()["vector"] == serialized
+
+
+@pytest.mark.parametrize("value", [1e39, -1e39, float("inf"), float("nan")])
+def test_non_finite_fp32_vector_is_rejected(value):
+    """Test that values that overflow FP32 or are not finite fail validation."""
+    document = VectorDocument(id="v", vector=[0.1, value], metadata={"repo_url": "r", "file_path": "a.md"}, text="")
+    
+    with pytest.raises(ValueError, match="all vector values must be finite"):
+        document.validate()
+
+
+def test_dtype_is_only_serialized_for_quantized_vectors():
+    """Test that FP32 dictionaries keep the original keys and quantized ones round-trip their dtype."""
+    metadata = {"repo_url": "r", "file_path": "a.md"}
+    fp32 = VectorDocument.from_embedding(id="v", embedding=[0.5, -0.5], metadata=metadata, text="t")
+    fp16 = VectorDocument.from_embedding(id="v", embedding=[0.5, -0.5], metadata=metadata, text="t", quantize="fp16")
+    
+    assert set(fp32.to_dict()) == {"id", "vector", "metadata", "text"}
+    assert VectorDocument.from_dict(fp32.to_dict()).dtype == "fp32"
+    
+    assert fp16.to_dict()["dtype"] == "fp16"
+    restored = VectorDocument.from_dict(fp16.to_dict())
+    assert restored.dtype == "fp16"
+    assert restored.as_fp32().tolist() == [0.5, -0.5]
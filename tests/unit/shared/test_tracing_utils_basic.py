@@ -0,0 +1,77 @@
+"""Basic unit tests for X-Ray tracing utilities."""
+
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+
+# Lambda directory added to path via conftest.py
+
+from shared import tracing_utils
+
+
+def count_sampled(calls):
+    """Count how many of the next calls on a fresh thread are sampled."""
+    results = []
+    worker = threading.Thread(target=lambda: results.extend(tracing_utils._should_sample() for _ in range(calls)))
+    worker.start()
+    worker.join()
+    return sum(results), results
+
+
+@pytest.mark.parametrize("rate, calls, expected", [
+    (1.0, 100, 100),
+    (0.0, 100, 0),
+    (0.5, 100, 50),
+    (0.25, 100, 25),
+    (0.125, 1000, 125),
+])
+def test_should_sample_keeps_exact_fraction(rate, calls, expected):
+    """Test that the per-thread credit samples exactly the configured fraction."""
+    with patch.object(tracing_utils, '_SAMPLE_RATE', rate):
+        sampled, _ = count_sampled(calls)
+    
+    assert sampled == expected
+
+
+def test_should_sample_spreads_samples_evenly():
+    """Test that samples are spaced out rather than bunched together."""
+    with patch.object(tracing_utils, '_SAMPLE_RATE', 0.25):
+        _, results = count_sampled(8)
+    
+    assert results == [False, False, False, True, False, False, False, True]
+
+
+def test_should_sample_keeps_credit_per_thread():
+    """Test that a thread's credit is not consumed by other threads."""
+    with patch.object(tracing_utils, '_SAMPLE_RATE', 0.5):
+        first, _ = count_sampled(1)
+        second, _ = count_sampled(1)
+    
+    assert first == 0
+    assert second == 0
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("0.3", 0.3),
+    ("2", 1.0),
+    ("-1", 0.0),
+    ("abc", 1.0),
+    ("", 1.0),
+    ("nan", 1.0),
+])
+def test_read_sample_rate_clamps_and_falls_back(raw, expected):
+    """Test that the sample rate is clamped and malformed values fall back to 1.0."""
+    with patch.dict(os.environ, {'XRAY_SAMPLE_RATE': raw}):
+        assert tracing_utils._read_sample_rate() == expected
+
+
+def test_read_sample_rate_warns_on_malformed_value():
+    """Test that a malformed sample rate is logged instead of raised."""
+    with patch.dict(os.environ, {'XRAY_SAMPLE_RATE': 'ten percent'}), \
+         patch.object(tracing_utils.logger, 'warning') as warning:
+        assert tracing_utils._read_sample_rate() == 1.0
+    
+    warning.assert_called_once()
+    assert 'ten percent' in warning.call_args[0][0]
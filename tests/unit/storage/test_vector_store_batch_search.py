@@ -0,0 +1,73 @@
+"""Basic unit tests for VectorStoreManager batch similarity search."""
+
+from unittest.mock import Mock
+
+import pytest
+
+# Lambda directory added to path via conftest.py
+
+from storage.vector_store_manager import VectorStoreManager, VectorStoreError
+
+
+def create_hit(doc_id: str, score: float) -> dict:
+    """Create an OpenSearch search hit."""
+    return {
+        '_id': doc_id,
+        '_score': score,
+        '_source': {
+            'text': f'Text of {doc_id}',
+            'metadata': {'repo_url': 'https://github.com/org/repo', 'file_path': f'{doc_id}.md'},
+            'vector': [0.1, 0.2]
+        }
+    }
+
+
+def create_manager(msearch_response: dict) -> VectorStoreManager:
+    """Create a VectorStoreManager with a mocked OpenSearch client."""
+    mock_client = Mock()
+    mock_client.msearch = Mock(return_value=msearch_response)
+    return VectorStoreManager(
+        opensearch_endpoint='test.aoss.amazonaws.com',
+        index_name='test-index',
+        opensearch_client=mock_client,
+        embeddings=Mock()
+    )
+
+
+def test_batch_search_sends_one_msearch_request():
+    """Test that all query vectors are sent in a single multi-search request."""
+    manager = create_manager({'responses': [
+        {'hits': {'hits': [create_hit('a', 0.9), create_hit('b', 0.5)]}},
+        {'hits': {'hits': [create_hit('c', 0.7)]}}
+    ]})
+    
+    results = manager.similarity_search_batch([[1.0, 0.0], [0.0, 1.0]], k=2)
+    
+    manager.client.msearch.assert_called_once()
+    body = manager.client.msearch.call_args[1]['body']
+    assert body[0] == {'index': 'test-index'}
+    assert body[1]['query']['knn']['vector']['vector'] == [1.0, 0.0]
+    assert body[3]['query']['knn']['vector']['vector'] == [0.0, 1.0]
+    
+    assert [[r['id'] for r in result] for result in results] == [['a', 'b'], ['c']]
+    assert results[0][0]['score'] == 0.9
+    assert results[1][0]['metadata']['file_path'] == 'c.md'
+
+
+def test_batch_search_with_no_vectors_skips_request():
+    """Test that an empty batch does not call OpenSearch."""
+    manager = create_manager({'responses': []})
+    
+    assert manager.similarity_search_batch([]) == []
+    manager.client.msearch.assert_not_called()
+
+
+def test_batch_search_raises_on_failed_item():
+    """Test that a failed search within the batch raises VectorStoreError."""
+    manager = create_manager({'responses': [
+        {'hits': {'hits': []}},
+        {'error': {'type': 'index_not_found_exception'}}
+    ]})
+    
+    with pytest.raises(VectorStoreError):
+        manager.similarity_search_batch([[1.0, 0.0], [0.0, 1.0]])
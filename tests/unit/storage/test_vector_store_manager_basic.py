@@ -0,0 +1,20 @@
+"""Basic unit tests for VectorStoreManager client configuration."""
+
+from unittest.mock import Mock
+
+# Lambda directory added to path via conftest.py
+
+from storage.vector_store_manager import VectorStoreManager
+
+
+def test_client_kwargs_override_default_pool_size():
+    """Test that client_kwargs are merged over the default client options."""
+    manager = VectorStoreManager(
+        opensearch_endpoint='test.aoss.amazonaws.com',
+        index_name='test-index',
+        opensearch_client=Mock(),
+        embeddings=Mock(),
+        client_kwargs={'pool_maxsize': 50}
+    )
+    
+    assert manager.client_kwargs['pool_maxsize'] == 50